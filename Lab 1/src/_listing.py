@@ -0,0 +1,70 @@
+"""
+Directory listing row rendering for the HTTP file server
+
+Kept separate and fully typed so it can be compiled ahead of time with mypyc:
+
+    pip install mypy
+    cd src && mypyc _listing.py
+
+mypyc writes the _listing extension module (and a build/ directory) into the
+current directory, so run it from src/ to put the module next to this file,
+where Python imports it in preference to the source. Without the build this
+file runs as is.
+"""
+
+import html
+import os
+import re
+import urllib.parse
+from typing import Dict, Tuple
+
+# Icon class, icon label and name prefix for each listed file type, pre-encoded for the row template
+ICON_BY_EXT: Dict[str, Tuple[bytes, bytes, bytes]] = {
+    '.pdf': (b'icon-pdf', b'PDF', b'&sdot;'),
+    '.png': (b'icon-img', b'IMG', b'&hearts;'),
+    '.jpg': (b'icon-img', b'IMG', b'&hearts;'),
+    '.jpeg': (b'icon-img', b'IMG', b'&hearts;'),
+    '.html': (b'icon-html', b'WEB', b'&clubs;'),
+}
+ICON_DIR: Tuple[bytes, bytes, bytes] = (b'icon-dir', b'DIR', b'&raquo;')
+ICON_FILE: Tuple[bytes, bytes, bytes] = (b'icon-file', b'FILE', b'&diams;')
+
+# Fields: href, icon class, icon label, name prefix, name, size
+ROW = b'''<tr>
+                    <td><a href="%s" class="file-link">
+                        <span class="file-icon %s">%s</span>
+                        <span class="file-name">%s %s</span>
+                    </a></td>
+                    <td class="file-size">%s</td>
+                </tr>'''
+
+# Names and paths made only of these characters need no HTML escaping or URL quoting
+_SAFE = re.compile(r'\A[A-Za-z0-9._\-/ ]*\Z')
+
+def quote_href(path: str) -> str:
+    """Percent-encode a path for an href attribute"""
+    return path if _SAFE.match(path) else urllib.parse.quote(path)
+
+def escape_html(text: str) -> str:
+    """Escape text for an HTML element or attribute"""
+    return text if _SAFE.match(text) else html.escape(text)
+
+def format_size(size: int) -> bytes:
+    """Format a byte count for the listing"""
+    if size < 1024:
+        return b"%d B" % size
+    elif size < 1024*1024:
+        return b"%.1f KB" % (size/1024)
+    else:
+        return b"%.1f MB" % (size/(1024*1024))
+
+def render_row(name: str, is_dir: bool, size: int, base_href: str) -> bytes:
+    """Render one listing row for an entry under an already quoted base href"""
+    href = f"{base_href}/{quote_href(name)}".encode('utf-8')
+    shown = escape_html(name).encode('utf-8')
+    if is_dir:
+        icon_class, icon_text, prefix = ICON_DIR
+        return ROW % (href + b'/', icon_class, icon_text, prefix, shown + b'/', b'-')
+
+    icon_class, icon_text, prefix = ICON_BY_EXT.get(os.path.splitext(name)[1].lower(), ICON_FILE)
+    return ROW % (href, icon_class, icon_text, prefix, shown, format_size(size))
@@ -7,50 +7,57 @@ A simple HTTP client that can download files from the HTTP file server.
 Usage: client.py server_host server_port url_path directory
 """
 
+import io
 import socket
 import sys
 import os
 import urllib.parse
 
+# Bytes read per recv call; larger chunks mean fewer syscalls per download
+RECV_CHUNK_SIZE = 64 * 1024
+# Kernel receive buffer requested so large chunks are actually available
+SOCKET_RCVBUF = 1 << 20
+# Largest response header block accepted, the same cap the server puts on requests
+MAX_HEADER_BYTES = 64 * 1024
+
 class HTTPClient:
     def __init__(self):
-        pass
+        # Reusable receive buffer, filled in place by recv_into
+        self.recv_buffer = bytearray(RECV_CHUNK_SIZE)
+        self.recv_view = memoryview(self.recv_buffer)
+        # Keep-alive sockets reused across download_file calls, keyed by (host, port)
+        self._conn = {}
     
     def parse_http_response(self, response_data):
         """Parse HTTP response and return headers and body"""
         try:
-            # Split headers and body
-            parts = response_data.split(b'\r\n\r\n', 1)
-            if len(parts) != 2:
+            # Only the header block is decoded; the body stays raw bytes
+            sep = response_data.find(b'\r\n\r\n')
+            if sep < 0:
                 raise ValueError("Invalid HTTP response format")
             
-            headers_data, body = parts
-            headers_text = headers_data.decode('utf-8')
-            
-            # Parse headers
-            header_lines = headers_text.split('\r\n')
-            status_line = header_lines[0]
+            header_lines = response_data[:sep].split(b'\r\n')
             
             # Parse status line
-            status_parts = status_line.split(' ', 2)
+            status_parts = header_lines[0].split(b' ', 2)
             if len(status_parts) < 2:
                 raise ValueError("Invalid status line")
             
             status_code = int(status_parts[1])
-            status_message = status_parts[2] if len(status_parts) > 2 else ""
+            status_message = status_parts[2].decode('latin-1') if len(status_parts) > 2 else ""
             
             # Parse header fields
             headers = {}
             for line in header_lines[1:]:
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    headers[key.strip().lower()] = value.strip()
+                key, colon, value = line.partition(b':')
+                if colon:
+                    headers[key.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
             
             return {
                 'status_code': status_code,
                 'status_message': status_message,
                 'headers': headers,
-                'body': body
+                'body': memoryview(response_data)[sep + 4:]
             }
             
         except Exception as e:
@@ -61,46 +68,154 @@ class HTTPClient:
         request = f"{method} {path} HTTP/1.1\r\n"
         request += f"Host: {host}:{port}\r\n"
         request += "User-Agent: HTTPClient/1.0\r\n"
-        request += "Connection: close\r\n"
+        request += "Connection: keep-alive\r\n"
         request += "\r\n"
         return request.encode('utf-8')
     
-    def download_file(self, host, port, url_path, save_directory):
-        """Download a file from the server"""
+    def get_connection(self, host, port):
+        """Return (socket, reused) for host:port, connecting if nothing is cached"""
+        client_socket = self._conn.get((host, port))
+        if client_socket is not None:
+            return client_socket, True
         
-        # Create socket
         client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        
         try:
+            # Set before connect so the advertised TCP window uses it
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
             print(f"Connecting to {host}:{port}")
             client_socket.connect((host, port))
-            
+        except OSError:
+            client_socket.close()
+            raise
+        self._conn[(host, port)] = client_socket
+        return client_socket, False
+    
+    def close_connection(self, host, port):
+        """Close and forget the cached socket for host:port"""
+        client_socket = self._conn.pop((host, port), None)
+        if client_socket is not None:
+            client_socket.close()
+    
+    def close(self):
+        """Close every cached connection"""
+        for host, port in list(self._conn):
+            self.close_connection(host, port)
+    
+    def send_request(self, host, port, request):
+        """Send request and receive its headers, return (socket, bytes read)"""
+        client_socket, reused = self.get_connection(host, port)
+        try:
+            client_socket.sendall(request)
+            buf = self.receive_headers(client_socket)
+        except OSError:
+            if not reused:
+                raise
+            buf = b''
+        if buf or not reused:
+            return client_socket, buf
+        
+        # The server closed the idle keep-alive socket; retry once on a fresh one
+        self.close_connection(host, port)
+        client_socket, _ = self.get_connection(host, port)
+        client_socket.sendall(request)
+        return client_socket, self.receive_headers(client_socket)
+    
+    def receive_headers(self, client_socket):
+        """Receive until the end of the header block, return everything read so far"""
+        buf = bytearray()
+        view = self.recv_view
+        scan_from = 0
+        while True:
+            n = client_socket.recv_into(view)
+            if not n:
+                break
+            buf += view[:n]
+            # only look at the new bytes (plus 3 in case the terminator was split)
+            if buf.find(b'\r\n\r\n', scan_from) >= 0:
+                break
+            if len(buf) > MAX_HEADER_BYTES:
+                raise ValueError(f"Response headers exceed {MAX_HEADER_BYTES} bytes")
+            scan_from = max(0, len(buf) - 3)
+        return buf
+    
+    def stream_body(self, client_socket, initial, content_length, sink):
+        """Write the response body to sink as it arrives, return bytes written"""
+        written = 0
+        if initial:
+            if content_length >= 0:
+                initial = initial[:content_length]
+            sink.write(initial)
+            written = len(initial)
+        view = self.recv_view
+        while content_length < 0 or written < content_length:
+            # never read past Content-Length: what follows belongs to the next response
+            n = client_socket.recv_into(view, len(view) if content_length < 0 else min(len(view), content_length - written))
+            if not n:
+                break
+            sink.write(view[:n])
+            written += n
+        return written
+    
+    def read_body(self, client_socket, initial, content_length):
+        """Read the rest of the response body into memory (for small text replies)"""
+        body = io.BytesIO()
+        self.stream_body(client_socket, initial, content_length, body)
+        return body.getvalue()
+    
+    def body_complete(self, written, content_length):
+        """Check that the whole body arrived, reporting a short read as an error"""
+        if content_length >= 0 and written != content_length:
+            print(f"Error: connection closed after {written} of {content_length} body bytes")
+            return False
+        return True
+    
+    def prepare_save_path(self, save_directory, url_path):
+        """Make sure save_directory exists and return the target file path"""
+        filename = os.path.basename(url_path) or 'downloaded_file'
+        
+        if not os.path.exists(save_directory):
+            os.makedirs(save_directory)
+            print(f"Created directory: {save_directory}")
+        
+        return os.path.join(save_directory, filename)
+    
+    def download_file(self, host, port, url_path, save_directory):
+        """Download a file from the server"""
+        
+        # The socket stays open for the next call only if the body was read to
+        # exactly its Content-Length and the server did not ask to close
+        reusable = False
+        
+        try:
             # Create and send HTTP request
             request = self.create_http_request('GET', url_path, host, port)
             print(f"Sending request: GET {url_path}")
-            client_socket.sendall(request)
-            
-            # Receive response
-            response_data = b''
-            while True:
-                chunk = client_socket.recv(4096)
-                if not chunk:
-                    break
-                response_data += chunk
+            # Receive headers; whatever body bytes arrived with them are kept
+            client_socket, buf = self.send_request(host, port, request)
             
             # Parse response
-            response = self.parse_http_response(response_data)
+            response = self.parse_http_response(buf)
             
             print(f"Response status: {response['status_code']} {response['status_message']}")
             
+            content_length = int(response['headers'].get('content-length', -1))
+            if 'chunked' in response['headers'].get('transfer-encoding', '').lower():
+                # Chunked framing is not decoded: read until the server closes
+                content_length = -1
+            # Without a Content-Length the body ends at close, so the socket is not kept
+            keep_alive = (content_length >= 0 and
+                          response['headers'].get('connection', '').lower() != 'close')
+            
             if response['status_code'] != 200:
                 print(f"Error: Server returned status {response['status_code']}")
-                if response['body']:
+                body = self.read_body(client_socket, response['body'], content_length)
+                if body:
                     print("Response body:")
                     try:
-                        print(response['body'].decode('utf-8'))
+                        print(body.decode('utf-8'))
                     except UnicodeDecodeError:
                         print("[Binary content]")
+                reusable = keep_alive and len(body) == content_length
                 return False
             
             # Get content type
@@ -110,52 +225,51 @@ class HTTPClient:
             # Handle different content types
             if content_type.startswith('text/html'):
                 # HTML content - print to console
+                body = self.read_body(client_socket, response['body'], content_length)
+                if not self.body_complete(len(body), content_length):
+                    return False
                 print("\\n--- HTML Content ---")
                 try:
-                    html_content = response['body'].decode('utf-8')
+                    html_content = body.decode('utf-8')
                     print(html_content)
                 except UnicodeDecodeError:
                     print("[Unable to decode HTML content]")
                 print("--- End HTML Content ---\\n")
                 
             elif content_type in ['image/png', 'application/pdf'] or url_path.endswith(('.png', '.pdf')):
-                # Binary file - save to directory
-                filename = os.path.basename(url_path) or 'downloaded_file'
-                
-                # Ensure save directory exists
-                if not os.path.exists(save_directory):
-                    os.makedirs(save_directory)
-                    print(f"Created directory: {save_directory}")
+                # Binary file - stream straight to disk
+                filepath = self.prepare_save_path(save_directory, url_path)
+                filename = os.path.basename(filepath)
                 
-                filepath = os.path.join(save_directory, filename)
-                
-                # Save file
                 with open(filepath, 'wb') as f:
-                    f.write(response['body'])
+                    file_size = self.stream_body(client_socket, response['body'], content_length, f)
                 
-                file_size = len(response['body'])
+                if not self.body_complete(file_size, content_length):
+                    # Do not leave a truncated file behind
+                    os.remove(filepath)
+                    return False
                 print(f"Saved {filename} ({file_size} bytes) to {filepath}")
                 
             else:
                 # Unknown content type - try to display as text, otherwise save as binary
+                body = self.read_body(client_socket, response['body'], content_length)
+                if not self.body_complete(len(body), content_length):
+                    return False
                 try:
-                    text_content = response['body'].decode('utf-8')
+                    text_content = body.decode('utf-8')
                     print("\\n--- Text Content ---")
                     print(text_content)
                     print("--- End Text Content ---\\n")
                 except UnicodeDecodeError:
                     # Save as binary file
-                    filename = os.path.basename(url_path) or 'downloaded_file'
-                    
-                    if not os.path.exists(save_directory):
-                        os.makedirs(save_directory)
-                    
-                    filepath = os.path.join(save_directory, filename)
+                    filepath = self.prepare_save_path(save_directory, url_path)
+                    filename = os.path.basename(filepath)
                     with open(filepath, 'wb') as f:
-                        f.write(response['body'])
+                        f.write(body)
                     
                     print(f"Saved binary file {filename} to {filepath}")
             
+            reusable = keep_alive
             return True
             
         except socket.error as e:
@@ -165,7 +279,8 @@ class HTTPClient:
             print(f"Error: {e}")
             return False
         finally:
-            client_socket.close()
+            if not reusable:
+                self.close_connection(host, port)
 
 def main():
     """Main function"""
@@ -195,6 +310,7 @@ def main():
     
     client = HTTPClient()
     success = client.download_file(server_host, server_port, url_path, directory)
+    client.close()
     
     if success:
         print("\\n✓ Request completed successfully")
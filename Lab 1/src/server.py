@@ -5,48 +5,173 @@ Lab 1 - Protocols and Programming (PR)
 
 A simple HTTP file server that serves static files from a directory.
 Supports HTML, PNG, and PDF files with directory listing functionality.
-Built using raw TCP sockets for educational purposes.
+Speaks HTTP directly over asyncio TCP streams (no HTTP library): one event
+loop multiplexes all connections while file I/O runs in a thread pool.
 """
 
-import socket
+import asyncio
+import email.utils
+import functools
 import os
+import socket
 import sys
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Row rendering lives in its own typed module so it can be compiled with mypyc
+from _listing import escape_html, quote_href, render_row
+
+LISTEN_BACKLOG = 1024
+
+# Largest request head (request line + headers) read before the request is refused
+MAX_HEADER_BYTES = 64 * 1024
+
+# Per-connection send buffer, so large responses need fewer send calls
+SEND_BUFFER_SIZE = 1 << 20
+
+# Pending TCP Fast Open connections the listen socket may queue (Linux)
+FASTOPEN_QUEUE = 256
+
+# REUSE_PORT=1 lets several server processes share port 8000 (SO_REUSEPORT); off by
+# default so a second instance started by mistake fails with "address in use"
+REUSE_PORT = os.getenv('REUSE_PORT', '').lower() in ('1', 'true', 'yes')
+
+# Threads for blocking file and directory work, so slow disks overlap
+WORKER_THREADS = 32
+
+# Files below this size are kept in memory and sent with the headers
+SMALL_FILE_LIMIT = 64 * 1024
+
+# Read size when a large file has to be streamed without sendfile
+FILE_CHUNK_SIZE = 64 * 1024
+
+# How long browsers may reuse a file before revalidating it
+CACHE_MAX_AGE = 3600
+
+# Idle seconds and requests per connection before a keep-alive connection is closed
+KEEP_ALIVE_TIMEOUT = 5
+KEEP_ALIVE_MAX = 100
+
+_CONNECTION_HEADERS = {
+    True: b"Connection: keep-alive\r\nKeep-Alive: timeout=%d, max=%d\r\n" % (KEEP_ALIVE_TIMEOUT, KEEP_ALIVE_MAX),
+    False: b"Connection: close\r\n",
+}
+
+_CACHE_CONTROL = b"Cache-Control: public, max-age=%d\r\n" % CACHE_MAX_AGE
+
+# Served extensions -> (MIME type, whether the Content-Type carries a utf-8 charset)
+_MIME = {
+    '.html': ('text/html', True),
+    '.png': ('image/png', False),
+    '.pdf': ('application/pdf', False),
+    '.jpg': ('image/jpeg', False),
+    '.jpeg': ('image/jpeg', False),
+}
+_MIME_DEFAULT = ('text/plain', False)
+
+# Full Content-Type header value for each MIME type, built once from _MIME
+_CONTENT_TYPE = {mime: (f"{mime}; charset=utf-8" if charset else mime).encode('ascii')
+                 for mime, charset in _MIME.values()}
+
 def get_mime_type(file_path):
     """Get MIME type for file"""
-    if file_path.endswith('.html'):
-        return 'text/html'
-    elif file_path.endswith('.png'):
-        return 'image/png'
-    elif file_path.endswith('.pdf'):
-        return 'application/pdf'
-    elif file_path.endswith('.jpg') or file_path.endswith('.jpeg'):
-        return 'image/jpeg'
-    else:
-        return 'text/plain'
-
-def create_response(status, content_type, body):
+    return _MIME.get(os.path.splitext(file_path)[1].lower(), _MIME_DEFAULT)[0]
+
+def create_headers(status, content_type, length, extra_headers=b"", keep_alive=False):
+    """Create the status line and headers of an HTTP response"""
+    # Simple, working HTTP response format with proper charset, formatted in one pass
+    content_type = _CONTENT_TYPE.get(content_type) or content_type.encode('utf-8')
+    return b"HTTP/1.1 %s\r\nContent-Type: %s\r\nContent-Length: %d\r\n%s%s\r\n" % (
+        status.encode('ascii'), content_type, length, extra_headers, _CONNECTION_HEADERS[keep_alive])
+
+def create_response(status, content_type, body, keep_alive=False):
     """Create proper HTTP response"""
     if isinstance(body, str):
         body = body.encode('utf-8')
     
-    # Simple, working HTTP response format with proper charset
-    response = f"HTTP/1.1 {status}\r\n"
-    if content_type == "text/html":
-        response += f"Content-Type: {content_type}; charset=utf-8\r\n"
-    else:
-        response += f"Content-Type: {content_type}\r\n"
-    response += f"Content-Length: {len(body)}\r\n"
-    response += "Connection: close\r\n"
-    response += "\r\n"
+    return create_headers(status, content_type, len(body), keep_alive=keep_alive) + body
+
+@functools.lru_cache(maxsize=128)
+def _read_cached(path, mtime_ns, size):
+    """Read a small file; mtime and size are part of the key so edits are picked up"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def create_not_modified(etag, keep_alive=False):
+    """Create 304 response for a client whose cached copy is still current"""
+    return b"HTTP/1.1 304 Not Modified\r\nETag: %s\r\n%s%s\r\n" % (
+        etag.encode('ascii'), _CACHE_CONTROL, _CONNECTION_HEADERS[keep_alive])
+
+def is_not_modified(request_headers, etag, mtime):
+    """Check the client's conditional headers against the file's validators"""
+    if_none_match = request_headers.get('if-none-match')
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        return if_none_match.strip() == '*' or etag in [t.strip() for t in if_none_match.split(',')]
     
-    return response.encode('utf-8') + body
+    if_modified_since = request_headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return int(mtime) <= email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
 
-def create_404():
-    """Create 404 response"""
-    html = """<!DOCTYPE html>
+def parse_range(range_header, size):
+    """Parse a single 'bytes=start-end' range into inclusive (start, end), or None to ignore it"""
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None  # other units and multipart ranges get the whole file
+    
+    first, sep, last = (part.strip() for part in spec.partition('-'))
+    if not sep or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if not first:
+        # Suffix range: the last N bytes (a zero-length suffix cannot be satisfied)
+        length = int(last)
+        return (max(size - length, 0), size - 1) if length else (size, size)
+    
+    start = int(first)
+    if not last:
+        return start, size - 1
+    return None if int(last) < start else (start, min(int(last), size - 1))
+
+def create_file_response(file_path, content_type, extra_headers=b"", request_headers=None, keep_alive=False):
+    """Create a response for a file: small files inline, large ones as (headers, file_path, offset, count) for sendfile"""
+    st = os.stat(file_path)
+    request_headers = request_headers or {}
+    
+    # Validators let repeat visitors get a bodiless 304 instead of the file
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    if is_not_modified(request_headers, etag, st.st_mtime):
+        return create_not_modified(etag, keep_alive)
+    
+    extra_headers = b"%sAccept-Ranges: bytes\r\nETag: %s\r\nLast-Modified: %s\r\n%s" % (
+        extra_headers, etag.encode('ascii'),
+        email.utils.formatdate(st.st_mtime, usegmt=True).encode('ascii'), _CACHE_CONTROL)
+    
+    # Serve a byte range only while the client's copy (If-Range) still matches
+    status, start, end = "200 OK", 0, st.st_size - 1
+    range_header = request_headers.get('range')
+    if range_header and request_headers.get('if-range', etag) == etag:
+        byte_range = parse_range(range_header, st.st_size)
+        if byte_range is not None:
+            start, end = byte_range
+            if start >= st.st_size:
+                return create_headers("416 Range Not Satisfiable", "text/plain", 0,
+                                      b"Content-Range: bytes */%d\r\n" % st.st_size, keep_alive)
+            status = "206 Partial Content"
+            extra_headers += b"Content-Range: bytes %d-%d/%d\r\n" % (start, end, st.st_size)
+    
+    count = end - start + 1
+    headers = create_headers(status, content_type, count, extra_headers, keep_alive)
+    if st.st_size < SMALL_FILE_LIMIT:
+        return headers + _read_cached(file_path, st.st_mtime_ns, st.st_size)[start:end + 1]
+    return headers, file_path, start, count
+
+# The 404 page never changes, so the full response is built once per connection mode
+_NOT_FOUND_PAGE = """<!DOCTYPE html>
 <html>
 <head>
     <title>404 Not Found</title>
@@ -103,99 +228,45 @@ def create_404():
     </div>
 </body>
 </html>"""
-    return create_response("404 Not Found", "text/html", html)
+_NOT_FOUND_BYTES = {
+    keep_alive: create_response("404 Not Found", "text/html", _NOT_FOUND_PAGE, keep_alive)
+    for keep_alive in (True, False)
+}
 
-def create_directory_listing(dir_path, url_path):
-    """Create directory listing"""
-    items = []
-    
-    # Add parent directory if not root
-    if url_path != '/':
-        parent = '/'.join(url_path.rstrip('/').split('/')[:-1]) or '/'
-        items.append(f'''<tr>
-            <td><a href="{parent}" class="file-link">
-                <span class="file-icon icon-dir">DIR</span>
-                <span class="file-name">&uarr; Parent Directory</span>
-            </a></td>
-            <td class="file-size">-</td>
-        </tr>''')
-    
-    # List contents
-    try:
-        for item in sorted(os.listdir(dir_path)):
-            item_path = os.path.join(dir_path, item)
-            if os.path.isdir(item_path):
-                href = f"{url_path.rstrip('/')}/{item}/"
-                items.append(f'''<tr>
-                    <td><a href="{href}" class="file-link">
-                        <span class="file-icon icon-dir">DIR</span>
-                        <span class="file-name">&raquo; {item}/</span>
-                    </a></td>
-                    <td class="file-size">-</td>
-                </tr>''')
-            else:
-                href = f"{url_path.rstrip('/')}/{item}"
-                size = os.path.getsize(item_path)
-                
-                # Get file type icon and prefix
-                if item.endswith('.pdf'):
-                    icon_class = 'icon-pdf'
-                    icon_text = 'PDF'
-                    prefix = '&sdot;'
-                elif item.endswith(('.png', '.jpg', '.jpeg')):
-                    icon_class = 'icon-img'
-                    icon_text = 'IMG'
-                    prefix = '&hearts;'
-                elif item.endswith('.html'):
-                    icon_class = 'icon-html'
-                    icon_text = 'WEB'
-                    prefix = '&clubs;'
-                else:
-                    icon_class = 'icon-file'
-                    icon_text = 'FILE'
-                    prefix = '&diams;'
-                
-                # Format file size
-                if size < 1024:
-                    size_str = f"{size} B"
-                elif size < 1024*1024:
-                    size_str = f"{size/1024:.1f} KB"
-                else:
-                    size_str = f"{size/(1024*1024):.1f} MB"
-                
-                items.append(f'''<tr>
-                    <td><a href="{href}" class="file-link">
-                        <span class="file-icon {icon_class}">{icon_text}</span>
-                        <span class="file-name">{prefix} {item}</span>
-                    </a></td>
-                    <td class="file-size">{size_str}</td>
-                </tr>''')
-    except:
-        items.append('<tr><td>Error listing directory</td><td class="size">-</td></tr>')
-    
-    html = f"""<!DOCTYPE html>
+# Sent before closing a connection whose request head outgrew MAX_HEADER_BYTES
+_HEADERS_TOO_LARGE_BYTES = create_response(
+    "431 Request Header Fields Too Large", "text/plain", "Request headers too large\n")
+
+def create_404(keep_alive=False):
+    """Create 404 response"""
+    return _NOT_FOUND_BYTES[keep_alive]
+
+# Static parts of the listing page, encoded once; only the path and rows change per request
+_LISTING_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Index of {url_path}</title>
+    <title>Index of """.encode('utf-8')
+
+_LISTING_MID = """</title>
     <style>
-        * {{ 
+        * { 
             margin: 0; 
             padding: 0; 
             box-sizing: border-box; 
-        }}
+        }
         
-        body {{ 
+        body { 
             font-family: 'SF Pro Display', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: #ffffff;
             min-height: 100vh;
             padding: 20px;
             overflow-x: auto;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: rgba(255, 255, 255, 0.12);
@@ -204,14 +275,14 @@ def create_directory_listing(dir_path, url_path):
             backdrop-filter: blur(20px);
             border: 1px solid rgba(255, 255, 255, 0.18);
             box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 40px;
-        }}
+        }
         
-        h1 {{ 
+        h1 { 
             font-size: 2.8em;
             margin-bottom: 15px;
             font-weight: 600;
@@ -220,9 +291,9 @@ def create_directory_listing(dir_path, url_path):
             -webkit-text-fill-color: transparent;
             background-clip: text;
             text-shadow: none;
-        }}
+        }
         
-        .breadcrumb {{
+        .breadcrumb {
             background: rgba(0, 0, 0, 0.25);
             padding: 16px 24px;
             border-radius: 12px;
@@ -233,29 +304,29 @@ def create_directory_listing(dir_path, url_path):
             display: flex;
             align-items: center;
             gap: 12px;
-        }}
+        }
         
-        .breadcrumb::before {{
+        .breadcrumb::before {
             content: "⌂";
             font-size: 1.2em;
             font-weight: bold;
             margin-right: 8px;
-        }}
+        }
         
-        .file-table {{
+        .file-table {
             width: 100%;
             border-collapse: collapse;
             background: rgba(255, 255, 255, 0.08);
             border-radius: 16px;
             overflow: hidden;
             box-shadow: 0 8px 32px rgba(0, 0, 0, 0.12);
-        }}
+        }
         
-        .file-table thead {{
+        .file-table thead {
             background: linear-gradient(135deg, rgba(0, 0, 0, 0.4), rgba(0, 0, 0, 0.25));
-        }}
+        }
         
-        .file-table th {{
+        .file-table th {
             padding: 20px 24px;
             text-align: left;
             font-weight: 600;
@@ -263,25 +334,25 @@ def create_directory_listing(dir_path, url_path):
             letter-spacing: 0.5px;
             text-transform: uppercase;
             border: none;
-        }}
+        }
         
-        .file-table td {{
+        .file-table td {
             padding: 16px 24px;
             border-bottom: 1px solid rgba(255, 255, 255, 0.08);
             vertical-align: middle;
-        }}
+        }
         
-        .file-table tr:hover {{
+        .file-table tr:hover {
             background: rgba(255, 255, 255, 0.12);
             transform: translateY(-1px);
             transition: all 0.2s ease;
-        }}
+        }
         
-        .file-table tr:last-child td {{
+        .file-table tr:last-child td {
             border-bottom: none;
-        }}
+        }
         
-        .file-link {{
+        .file-link {
             color: #ffffff;
             text-decoration: none;
             display: flex;
@@ -289,14 +360,14 @@ def create_directory_listing(dir_path, url_path):
             gap: 12px;
             font-size: 1.05em;
             transition: all 0.2s ease;
-        }}
+        }
         
-        .file-link:hover {{
+        .file-link:hover {
             color: #81d4fa;
             transform: translateX(4px);
-        }}
+        }
         
-        .file-icon {{
+        .file-icon {
             font-family: 'SF Pro Display', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             font-weight: 600;
             padding: 8px 12px;
@@ -309,9 +380,9 @@ def create_directory_listing(dir_path, url_path):
             box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
             position: relative;
             overflow: hidden;
-        }}
+        }
         
-        .file-icon::before {{
+        .file-icon::before {
             content: '';
             position: absolute;
             top: -2px;
@@ -321,54 +392,54 @@ def create_directory_listing(dir_path, url_path):
             background: inherit;
             border-radius: inherit;
             z-index: -1;
-        }}
+        }
         
-        .icon-dir {{ 
+        .icon-dir { 
             background: linear-gradient(135deg, #FFD700, #FFA500); 
             color: #333; 
             border-color: #FFB347;
-        }}
-        .icon-pdf {{ 
+        }
+        .icon-pdf { 
             background: linear-gradient(135deg, #FF6B6B, #FF4757); 
             color: #fff; 
             border-color: #FF7979;
-        }}
-        .icon-img {{ 
+        }
+        .icon-img { 
             background: linear-gradient(135deg, #4ECDC4, #26D0CE); 
             color: #fff; 
             border-color: #55E6E1;
-        }}
-        .icon-html {{ 
+        }
+        .icon-html { 
             background: linear-gradient(135deg, #3742FA, #2F3542); 
             color: #fff; 
             border-color: #5352ED;
-        }}
-        .icon-file {{ 
+        }
+        .icon-file { 
             background: linear-gradient(135deg, #A4B0BE, #747D8C); 
             color: #fff; 
             border-color: #9CA4AF;
-        }}
+        }
         
-        .file-name {{
+        .file-name {
             font-weight: 500;
             flex-grow: 1;
-        }}
+        }
         
-        .file-size {{
+        .file-size {
             text-align: right;
             font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
             font-size: 0.9em;
             color: rgba(255, 255, 255, 0.7);
             min-width: 80px;
             font-weight: 500;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .container {{ padding: 20px; margin: 10px; }}
-            h1 {{ font-size: 2.2em; }}
-            .file-table th, .file-table td {{ padding: 12px 16px; }}
-            .breadcrumb {{ font-size: 1em; }}
-        }}
+        @media (max-width: 768px) {
+            .container { padding: 20px; margin: 10px; }
+            h1 { font-size: 2.2em; }
+            .file-table th, .file-table td { padding: 12px 16px; }
+            .breadcrumb { font-size: 1em; }
+        }
     </style>
 </head>
 <body>
@@ -379,7 +450,9 @@ def create_directory_listing(dir_path, url_path):
         
         <div class="breadcrumb">
             <span>Current Path:</span>
-            <strong>{url_path}</strong>
+            <strong>""".encode('utf-8')
+
+_LISTING_ROWS = """</strong>
         </div>
         
         <table class="file-table">
@@ -390,124 +463,274 @@ def create_directory_listing(dir_path, url_path):
                 </tr>
             </thead>
             <tbody>
-                {''.join(items)}
+                """.encode('utf-8')
+
+_LISTING_TAIL = """
             </tbody>
         </table>
     </div>
 </body>
-</html>"""
-    return create_response("200 OK", "text/html", html)
+</html>""".encode('utf-8')
+
+_PARENT_ROW = b'''<tr>
+            <td><a href="%s" class="file-link">
+                <span class="file-icon icon-dir">DIR</span>
+                <span class="file-name">&uarr; Parent Directory</span>
+            </a></td>
+            <td class="file-size">-</td>
+        </tr>'''
 
+_LISTING_ERROR_ROW = b'<tr><td>Error listing directory</td><td class="size">-</td></tr>'
 
+def _render_row(entry, base_href):
+    """Render one listing row for an os.scandir entry under an already quoted base href"""
+    # DirEntry answers is_dir from the directory read and caches stat, so no extra syscalls per check
+    is_dir = entry.is_dir()
+    return render_row(entry.name, is_dir, 0 if is_dir else entry.stat().st_size, base_href)
 
-def handle_download(root_dir, download_path):
-    """Handle file download with proper headers"""
-    file_path = os.path.join(root_dir, download_path.lstrip('/'))
-    file_path = os.path.abspath(file_path)
+def create_directory_listing(dir_path, url_path, keep_alive=False):
+    """Create directory listing"""
+    items = []
+    
+    # Add parent directory if not root
+    if url_path != '/':
+        parent = '/'.join(url_path.rstrip('/').split('/')[:-1]) or '/'
+        items.append(_PARENT_ROW % quote_href(parent).encode('utf-8'))
     
+    # List contents
+    try:
+        with os.scandir(dir_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        base_href = quote_href(url_path.rstrip('/'))
+        items.append(b"\n".join([_render_row(entry, base_href) for entry in entries]))
+    except:
+        items.append(_LISTING_ERROR_ROW)
+    
+    path_bytes = escape_html(url_path).encode('utf-8')
+    body = b"".join((_LISTING_HEAD, path_bytes, _LISTING_MID, path_bytes,
+                     _LISTING_ROWS, b"".join(items), _LISTING_TAIL))
+    return create_response("200 OK", "text/html", body, keep_alive)
+
+
+def resolve_path(root_dir, url_path):
+    """Resolve a URL path inside root_dir, or None if it escapes the root (symlinks included)"""
+    file_path = os.path.realpath(os.path.join(root_dir, url_path.lstrip('/')))
+    # commonpath compares whole components, so /srv/root2 is not inside /srv/root
+    if os.path.commonpath([root_dir, file_path]) != root_dir:
+        return None
+    return file_path
+
+def handle_download(root_dir, download_path, request_headers=None, keep_alive=False):
+    """Handle file download with proper headers"""
     # Security check
-    if not file_path.startswith(os.path.abspath(root_dir)):
-        return create_404()
+    file_path = resolve_path(root_dir, download_path)
+    if file_path is None:
+        return _NOT_FOUND_BYTES[keep_alive]
     
     if os.path.isfile(file_path):
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
             mime_type = get_mime_type(file_path)
             filename = os.path.basename(file_path)
             
             # Create response with download headers
-            response = f"HTTP/1.1 200 OK\r\n"
-            response += f"Content-Type: {mime_type}\r\n"
-            response += f"Content-Length: {len(content)}\r\n"
-            response += f"Content-Disposition: attachment; filename=\"{filename}\"\r\n"
-            response += "Connection: close\r\n"
-            response += "\r\n"
-            
-            return response.encode('utf-8') + content
+            disposition = b'Content-Disposition: attachment; filename="%s"\r\n' % filename.encode('utf-8')
+            return create_file_response(file_path, mime_type, disposition, request_headers, keep_alive)
         except:
-            return create_404()
+            return _NOT_FOUND_BYTES[keep_alive]
+    
+    return _NOT_FOUND_BYTES[keep_alive]
+
+def parse_request(request_data):
+    """Split a request head into (method, raw url path, version, headers), or None if malformed"""
+    # Parse request line on the raw bytes; only the path gets decoded later
+    request_line, _, header_block = request_data.partition(b'\r\n')
+    parts = request_line.split(b' ', 2)
+    if len(parts) < 2:
+        return None
+    
+    method, url_path = parts[0], parts[1]
+    version = parts[2].strip() if len(parts) > 2 else b'HTTP/1.0'
+    
+    # Header names are case-insensitive
+    request_headers = {}
+    for line in header_block.split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        if name:
+            request_headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+    
+    return method, url_path, version, request_headers
+
+def wants_keep_alive(method, version, request_headers):
+    """Check whether the client lets the connection carry another request"""
+    # A request body is never read, so it would be parsed as the next request
+    if method != b'GET' or 'content-length' in request_headers or 'transfer-encoding' in request_headers:
+        return False
     
-    return create_404()
+    connection = request_headers.get('connection', '').lower()
+    if version == b'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
 
-def handle_request(request_data, root_dir):
+def handle_request(request, root_dir, keep_alive=False):
     """Handle HTTP request"""
     try:
-        # Parse request
-        lines = request_data.decode('utf-8').split('\r\n')
-        if not lines:
-            return create_404()
+        method, url_path, version, request_headers = request
         
-        # Get method and path
-        parts = lines[0].split(' ')
-        if len(parts) < 2:
-            return create_404()
-        
-        method, url_path = parts[0], parts[1]
-        
-        if method != 'GET':
-            return create_404()
+        if method != b'GET':
+            return _NOT_FOUND_BYTES[keep_alive]
         
         # Clean path
-        url_path = urllib.parse.unquote(url_path.split('?')[0])
+        url_path = urllib.parse.unquote(url_path.split(b'?', 1)[0].decode('utf-8'))
         if not url_path.startswith('/'):
             url_path = '/' + url_path
         
-        # Convert to file path
-        if url_path == '/':
-            file_path = os.path.join(root_dir, 'index.html')
-        else:
-            file_path = os.path.join(root_dir, url_path.lstrip('/'))
-        
-        file_path = os.path.abspath(file_path)
-        
-        # Security check
-        if not file_path.startswith(os.path.abspath(root_dir)):
-            return create_404()
+        # Convert to file path (security check included)
+        file_path = resolve_path(root_dir, 'index.html' if url_path == '/' else url_path)
+        if file_path is None:
+            return _NOT_FOUND_BYTES[keep_alive]
         
         print(f"Request: {url_path} -> {file_path}")
         
         # Handle download requests (keep this simple feature)
         if url_path.startswith('/download/'):
             download_path = url_path[10:]  # Remove /download/ prefix
-            return handle_download(root_dir, download_path)
+            return handle_download(root_dir, download_path, request_headers, keep_alive)
         
         # Handle request
         if os.path.isfile(file_path):
             # Check supported extensions
-            if not any(file_path.endswith(ext) for ext in ['.html', '.png', '.pdf', '.jpg', '.jpeg']):
-                return create_404()
+            if os.path.splitext(file_path)[1].lower() not in _MIME:
+                return _NOT_FOUND_BYTES[keep_alive]
             
-            # Read and serve file
+            # Serve file (the body is streamed by the connection handler)
             try:
-                with open(file_path, 'rb') as f:
-                    content = f.read()
-                mime_type = get_mime_type(file_path)
-                return create_response("200 OK", mime_type, content)
+                return create_file_response(
+                    file_path, get_mime_type(file_path), request_headers=request_headers, keep_alive=keep_alive)
             except:
-                return create_404()
+                return _NOT_FOUND_BYTES[keep_alive]
         
         elif os.path.isdir(file_path):
             # Try index.html first
             index_path = os.path.join(file_path, 'index.html')
             if os.path.exists(index_path):
                 try:
-                    with open(index_path, 'rb') as f:
-                        content = f.read()
-                    return create_response("200 OK", "text/html", content)
+                    return create_file_response(
+                        index_path, "text/html", request_headers=request_headers, keep_alive=keep_alive)
                 except:
                     pass
             
             # Return directory listing
-            return create_directory_listing(file_path, url_path)
+            return create_directory_listing(file_path, url_path, keep_alive)
         
         else:
-            return create_404()
+            return _NOT_FOUND_BYTES[keep_alive]
             
     except Exception as e:
         print(f"Error: {e}")
-        return create_404()
+        return _NOT_FOUND_BYTES[keep_alive]
+
+async def send_file_body(loop, writer, f, offset, count):
+    """Send count bytes of an open file from offset with sendfile(2), or in fixed-size chunks where that is unavailable"""
+    try:
+        # loop.sendfile keeps calling os.sendfile until count bytes are out, so short sends are handled
+        await loop.sendfile(writer.transport, f, offset, count, fallback=False)
+    except asyncio.SendfileNotAvailableError:
+        # Draining after each chunk keeps at most one chunk buffered per connection
+        f.seek(offset)
+        while count > 0:
+            chunk = await loop.run_in_executor(None, f.read, min(FILE_CHUNK_SIZE, count))
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+            count -= len(chunk)
+
+async def handle_client(reader, writer, root_dir):
+    """Serve requests on one client connection until it closes, idles or hits the request limit"""
+    addr = writer.get_extra_info('peername')
+    print(f"🔗 Connection from {addr}")
+    loop = asyncio.get_running_loop()
+    
+    # TCP_NODELAY is already set by asyncio on every TCP transport
+    try:
+        writer.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+    except OSError:
+        pass  # keep the kernel default
+    
+    try:
+        for served in range(1, KEEP_ALIVE_MAX + 1):
+            try:
+                request_data = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                complete = True
+            except asyncio.IncompleteReadError as e:
+                request_data = e.partial  # client closed before finishing its headers
+                complete = False
+            except asyncio.LimitOverrunError:
+                # No end of headers within MAX_HEADER_BYTES: refuse instead of buffering more
+                print(f"❌ Request headers from {addr} exceed {MAX_HEADER_BYTES} bytes")
+                writer.write(_HEADERS_TOO_LARGE_BYTES)
+                await writer.drain()
+                break
+            except asyncio.TimeoutError:
+                break  # idle keep-alive connection, or headers trickling in too slowly
+            if not request_data:
+                break
+            
+            request = parse_request(request_data)
+            if request is None:
+                writer.write(_NOT_FOUND_BYTES[False])
+                await writer.drain()
+                break
+            
+            method, _, version, request_headers = request
+            keep_alive = complete and served < KEEP_ALIVE_MAX and wants_keep_alive(method, version, request_headers)
+            
+            # File reads and listings block, so they run in the loop's executor
+            response = await loop.run_in_executor(None, handle_request, request, root_dir, keep_alive)
+            if isinstance(response, tuple):
+                # Headers first, then the kernel copies the file straight to the socket
+                headers, file_path, offset, count = response
+                writer.write(headers)
+                await writer.drain()
+                with open(file_path, 'rb') as f:
+                    await send_file_body(loop, writer, f, offset, count)
+            else:
+                writer.write(response)
+            await writer.drain()
+            
+            if not keep_alive:
+                break
+    except Exception as e:
+        print(f"❌ Error handling request: {e}")
+    finally:
+        writer.close()
+
+async def serve(root_dir):
+    """Accept connections on port 8000 and multiplex them on one event loop"""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=WORKER_THREADS))
+    
+    # asyncio accepts up to `backlog` pending connections per readiness event,
+    # so a burst of clients is drained in one loop turn instead of one each
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(reader, writer, root_dir),
+        '0.0.0.0', 8000, reuse_address=True, reuse_port=REUSE_PORT,
+        backlog=LISTEN_BACKLOG, limit=MAX_HEADER_BYTES)
+    
+    if hasattr(socket, 'TCP_FASTOPEN'):
+        for sock in server.sockets:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_FASTOPEN, FASTOPEN_QUEUE)
+            except OSError:
+                pass  # kernel has Fast Open disabled for servers
+    
+    print(f"🚀 HTTP File Server started on http://localhost:8000")
+    print(f"📁 Serving directory: {root_dir}")
+    print("💡 Press Ctrl+C to stop the server")
+    print("-" * 50)
+    
+    async with server:
+        await server.serve_forever()
 
 def main():
     if len(sys.argv) != 2:
@@ -519,39 +742,16 @@ def main():
         print(f"Directory {root_dir} does not exist")
         sys.exit(1)
     
-    root_dir = os.path.abspath(root_dir)
-    
-    # Create socket
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Resolved once here; request paths are checked against it with resolve_path
+    root_dir = os.path.realpath(root_dir)
     
     try:
-        server_socket.bind(('0.0.0.0', 8000))
-        server_socket.listen(5)
-        
-        print(f"🚀 HTTP File Server started on http://localhost:8000")
-        print(f"📁 Serving directory: {root_dir}")
-        print("💡 Press Ctrl+C to stop the server")
-        print("-" * 50)
-        
-        while True:
-            client_socket, addr = server_socket.accept()
-            print(f"🔗 Connection from {addr}")
-            
-            try:
-                request_data = client_socket.recv(4096)
-                if request_data:
-                    response = handle_request(request_data, root_dir)
-                    client_socket.sendall(response)
-            except Exception as e:
-                print(f"❌ Error handling request: {e}")
-            finally:
-                client_socket.close()
-                
+        asyncio.run(serve(root_dir))
     except KeyboardInterrupt:
         print("\n🛑 Server stopped")
-    finally:
-        server_socket.close()
+    except OSError as e:
+        print(f"❌ Could not start server: {e}")
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from client import HTTPClient  # noqa: E402
+
+
+@pytest.fixture
+def canned_server():
+    """Start a server that answers each connection's first request with the given bytes"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    reply = {}
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.recv(65536)
+                    conn.sendall(reply["data"])
+                    if reply.get("hold"):
+                        conn.recv(65536)  # keep the connection open until the client closes it
+                except OSError:
+                    pass  # the client gave up first
+
+    threading.Thread(target=serve, daemon=True).start()
+
+    def start(data, hold=False):
+        reply.update(data=data, hold=hold)
+        return listener.getsockname()[1]
+
+    yield start
+    listener.close()
+
+
+def test_short_read_is_an_error_and_drops_the_connection(canned_server, tmp_path):
+    port = canned_server(b"HTTP/1.1 200 OK\r\nContent-Type: application/pdf\r\nContent-Length: 100\r\n\r\n" + b"x" * 40)
+    client = HTTPClient()
+    assert client.download_file("127.0.0.1", port, "/doc.pdf", str(tmp_path)) is False
+    assert not os.path.exists(tmp_path / "doc.pdf")
+    assert client._conn == {}
+
+
+def test_complete_body_keeps_the_connection(canned_server, tmp_path):
+    port = canned_server(b"HTTP/1.1 200 OK\r\nContent-Type: application/pdf\r\nContent-Length: 10\r\n\r\n" + b"x" * 10,
+                         hold=True)
+    client = HTTPClient()
+    try:
+        assert client.download_file("127.0.0.1", port, "/doc.pdf", str(tmp_path)) is True
+        assert (tmp_path / "doc.pdf").read_bytes() == b"x" * 10
+        assert ("127.0.0.1", port) in client._conn
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("framing", [b"", b"Transfer-Encoding: chunked\r\nContent-Length: 3\r\n"])
+def test_body_without_length_is_read_to_close_and_not_reused(canned_server, tmp_path, framing):
+    port = canned_server(b"HTTP/1.1 200 OK\r\nContent-Type: application/pdf\r\n" + framing + b"\r\n" + b"y" * 25)
+    client = HTTPClient()
+    assert client.download_file("127.0.0.1", port, "/doc.pdf", str(tmp_path)) is True
+    assert (tmp_path / "doc.pdf").read_bytes() == b"y" * 25
+    assert client._conn == {}
+
+
+def test_body_stops_at_content_length(canned_server, tmp_path):
+    first = b"HTTP/1.1 200 OK\r\nContent-Type: application/pdf\r\nContent-Length: 70000\r\n\r\n" + b"a" * 70000
+    port = canned_server(first + b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nnext!", hold=True)
+    client = HTTPClient()
+    try:
+        assert client.download_file("127.0.0.1", port, "/doc.pdf", str(tmp_path)) is True
+        assert (tmp_path / "doc.pdf").read_bytes() == b"a" * 70000
+    finally:
+        client.close()
+
+
+def test_oversized_response_headers_are_refused(canned_server, tmp_path):
+    port = canned_server(b"HTTP/1.1 200 OK\r\n" + b"X-Junk: " + b"j" * (200 * 1024), hold=True)
+    client = HTTPClient()
+    assert client.download_file("127.0.0.1", port, "/doc.pdf", str(tmp_path)) is False
+    assert client._conn == {}
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+import server  # noqa: E402
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=900-5000", (900, 999)),   # end clamped to the file
+    ("bytes=100-", (100, 999)),       # open-ended
+    ("bytes=-200", (800, 999)),       # suffix: the last 200 bytes
+    ("bytes=-5000", (0, 999)),        # suffix longer than the file
+    ("bytes=-0", (1000, 1000)),       # empty suffix: unsatisfiable
+    ("bytes=1000-", (1000, 999)),     # starts past the end: unsatisfiable
+    (" Bytes = 5-9", (5, 9)),
+])
+def test_parse_range(header, expected):
+    assert server.parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=0-99,200-299",  # multi-range
+    "bytes=0-1, 5-",
+    "items=0-99",
+    "bytes=",
+    "bytes=-",
+    "bytes=5",
+    "bytes=abc-",
+    "bytes=1-2-3",
+    "bytes=99-10",
+    "bytes=+5-10",
+    "0-99",
+])
+def test_parse_range_ignores_multi_and_malformed_ranges(header):
+    assert server.parse_range(header, 1000) is None
+
+
+@pytest.fixture
+def small_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(bytes(range(256)) * 4)  # 1024 bytes, served inline
+    st = os.stat(path)
+    return str(path), f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def _split(response):
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0], head, body
+
+
+def test_range_request_gets_partial_content(small_file):
+    path, etag = small_file
+    status, head, body = _split(server.create_file_response(path, "text/plain", request_headers={"range": "bytes=-4"}))
+    assert status == b"HTTP/1.1 206 Partial Content"
+    assert b"Content-Range: bytes 1020-1023/1024" in head
+    assert body == bytes([252, 253, 254, 255])
+
+
+@pytest.mark.parametrize("header", ["bytes=-0", "bytes=1024-"])
+def test_unsatisfiable_range_gets_416(small_file, header):
+    path, etag = small_file
+    status, head, body = _split(server.create_file_response(path, "text/plain", request_headers={"range": header}))
+    assert status == b"HTTP/1.1 416 Range Not Satisfiable"
+    assert b"Content-Range: bytes */1024" in head
+    assert body == b""
+
+
+def test_multi_range_falls_back_to_whole_file(small_file):
+    path, etag = small_file
+    status, _, body = _split(server.create_file_response(path, "text/plain", request_headers={"range": "bytes=0-1,4-5"}))
+    assert status == b"HTTP/1.1 200 OK"
+    assert len(body) == 1024
+
+
+def test_if_range_with_current_etag_serves_the_range(small_file):
+    path, etag = small_file
+    headers = {"range": "bytes=0-9", "if-range": etag}
+    status, _, body = _split(server.create_file_response(path, "text/plain", request_headers=headers))
+    assert status == b"HTTP/1.1 206 Partial Content"
+    assert body == bytes(range(10))
+
+
+@pytest.mark.parametrize("if_range", ['"stale-etag"', "Thu, 01 Jan 1970 00:00:00 GMT"])
+def test_if_range_mismatch_falls_back_to_200(small_file, if_range):
+    path, etag = small_file
+    headers = {"range": "bytes=0-9", "if-range": if_range}
+    status, head, body = _split(server.create_file_response(path, "text/plain", request_headers=headers))
+    assert status == b"HTTP/1.1 200 OK"
+    assert b"Content-Range" not in head
+    assert len(body) == 1024
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('"abc-1"', True),
+    ('"other", "abc-1", "third"', True),
+    ('"other","abc-1"', True),
+    ("*", True),
+    (" * ", True),
+    ('"other", "third"', False),
+])
+def test_is_not_modified_if_none_match(if_none_match, expected):
+    assert server.is_not_modified({"if-none-match": if_none_match}, '"abc-1"', 1_000_000) is expected
+
+
+def test_if_none_match_wins_over_if_modified_since():
+    headers = {"if-none-match": '"other"', "if-modified-since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    assert server.is_not_modified(headers, '"abc-1"', 1_000_000) is False
+
+
+@pytest.mark.parametrize("if_modified_since, expected", [
+    ("Fri, 01 Jan 2100 00:00:00 GMT", True),
+    ("Thu, 01 Jan 1970 00:00:00 GMT", False),
+    ("not a date", False),
+    ("Fri, 99 Foo 2100 99:99:99 GMT", False),
+    ("", False),
+])
+def test_is_not_modified_if_modified_since(if_modified_since, expected):
+    assert server.is_not_modified({"if-modified-since": if_modified_since}, '"abc-1"', 1_000_000) is expected
+
+
+@pytest.fixture
+def roots(tmp_path):
+    base = os.path.realpath(tmp_path)
+    root = os.path.join(base, "content")
+    sibling = os.path.join(base, "content2")
+    os.makedirs(os.path.join(root, "docs"))
+    os.makedirs(sibling)
+    for path in (os.path.join(root, "docs", "a.txt"), os.path.join(sibling, "secret.txt"),
+                 os.path.join(base, "secret.txt")):
+        with open(path, "w") as f:
+            f.write("x")
+    return root, sibling
+
+
+def test_resolve_path_inside_root(roots):
+    root, _ = roots
+    assert server.resolve_path(root, "/docs/a.txt") == os.path.join(root, "docs", "a.txt")
+    assert server.resolve_path(root, "/") == root
+    assert server.resolve_path(root, "/docs/../docs/a.txt") == os.path.join(root, "docs", "a.txt")
+
+
+@pytest.mark.parametrize("url_path", [
+    "/../secret.txt",
+    "/docs/../../secret.txt",
+    "/..",
+    "/../content2/secret.txt",  # shares the "content" prefix but is a sibling directory
+])
+def test_resolve_path_rejects_escapes(roots, url_path):
+    root, _ = roots
+    assert server.resolve_path(root, url_path) is None
+
+
+def test_resolve_path_rejects_symlinks_out_of_root(roots):
+    root, sibling = roots
+    os.symlink(sibling, os.path.join(root, "outside_dir"))
+    os.symlink(os.path.join(sibling, "secret.txt"), os.path.join(root, "outside.txt"))
+    os.symlink(os.path.join(root, "docs", "a.txt"), os.path.join(root, "inside.txt"))
+    assert server.resolve_path(root, "/outside_dir/secret.txt") is None
+    assert server.resolve_path(root, "/outside.txt") is None
+    assert server.resolve_path(root, "/inside.txt") == os.path.join(root, "docs", "a.txt")
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import collections
 import threading
 import time
+import weakref
 from typing import Dict
 
 
@@ -47,3 +49,87 @@ class LockedCounter:
     def reset(self) -> None:
         with self._lock:
             self._counts.clear()
+
+
+class _Shard:
+    __slots__ = ("counts", "pending", "lock", "__weakref__")
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+        self.pending = 0
+        # only contended by snapshot/reset, never by other counting threads
+        self.lock = threading.Lock()
+
+
+class ShardedCounter(LockedCounter):
+    """
+    Thread-safe counter for long-lived worker threads (e.g. the evented loop).
+
+    Each thread counts into its own shard and merges it into the shared dict
+    every ``flush_every`` increments and when the thread exits. Shards are
+    created once per thread, so with a thread per request (ThreadingHTTPServer)
+    their setup costs more than the plain lock saves; use LockedCounter there.
+    Lock order is always the shared lock, then a shard lock. The exit-time
+    finalizer takes no lock at all: it can run while snapshot/reset hold the
+    shared lock (when they drop the last reference to a dead thread's shard),
+    so it only queues the leftovers for the next call to merge.
+    """
+
+    flush_every = 64
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._local = threading.local()
+        self._shards: "weakref.WeakSet[_Shard]" = weakref.WeakSet()
+        # counts of shards whose thread has exited, merged under the lock later
+        self._leftovers: "collections.deque[Dict[str, int]]" = collections.deque()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._lock:
+                self._shards.add(shard)
+            # queue leftovers once the owning thread is gone (see class docstring)
+            weakref.finalize(shard, self._leftovers.append, shard.counts)
+        return shard
+
+    def _merge_leftovers(self) -> None:
+        # caller holds self._lock
+        while self._leftovers:
+            for k, v in self._leftovers.popleft().items():
+                self._counts[k] = self._counts.get(k, 0) + v
+
+    def inc(self, key: str) -> None:
+        shard = self._shard()
+        with shard.lock:
+            counts = shard.counts
+            counts[key] = counts.get(key, 0) + 1
+            shard.pending += 1
+            flush = shard.pending >= self.flush_every
+        if flush:
+            with self._lock, shard.lock:
+                shard.pending = 0
+                for k, v in shard.counts.items():
+                    self._counts[k] = self._counts.get(k, 0) + v
+                shard.counts.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            self._merge_leftovers()
+            result = dict(self._counts)
+            for shard in list(self._shards):
+                with shard.lock:
+                    for k, v in shard.counts.items():
+                        result[k] = result.get(k, 0) + v
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._leftovers.clear()
+            self._counts.clear()
+            for shard in list(self._shards):
+                with shard.lock:
+                    shard.counts.clear()
+                    shard.pending = 0
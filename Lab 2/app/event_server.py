@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import heapq
+import io
+import itertools
+import selectors
+import socket
+import threading
+import time
+from http.server import HTTPServer
+from typing import Callable, Optional
+
+
+class _Connection:
+    """
+    Per-client state owned by the event loop.
+
+    It doubles as the "socket" handed to the request handler: reads are served
+    from the bytes the loop already collected and writes are queued in
+    ``outbuf`` until the loop can flush them without blocking.
+    """
+
+    def __init__(self, sock: socket.socket, addr) -> None:
+        self.sock = sock
+        self.addr = addr
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.sent = 0
+        self.pending = 0  # deferred callbacks still to run before responding
+
+    # --- socket-like surface used by StreamRequestHandler ---
+    def makefile(self, mode: str = "r", buffering: Optional[int] = None):
+        return io.BytesIO(bytes(self.inbuf))
+
+    def sendall(self, data) -> None:
+        self.outbuf += data
+
+    def settimeout(self, value: Optional[float]) -> None:
+        pass
+
+    def setsockopt(self, *args) -> None:
+        self.sock.setsockopt(*args)
+
+    def getpeername(self):
+        return self.addr
+
+    def getsockname(self):
+        return self.sock.getsockname()
+
+
+def _request_complete(buf: bytearray) -> bool:
+    end = buf.find(b"\r\n\r\n")
+    if end < 0:
+        return False
+    head = bytes(buf[:end]).lower()
+    i = head.find(b"\r\ncontent-length:")
+    if i < 0:
+        return True
+    j = head.find(b"\r\n", i + 2)
+    try:
+        length = int(head[i + 17:j if j >= 0 else None])
+    except ValueError:
+        return True
+    return len(buf) >= end + 4 + length
+
+
+class EventLoopHTTPServer(HTTPServer):
+    """
+    Single-threaded HTTP server that multiplexes every connection with selectors.
+
+    Accepting, reading requests and writing responses never block, so slow
+    clients do not hold up others and no thread is spawned per connection.
+    Handlers run on the loop thread; work that only waits (the artificial
+    handler delay) is handed back to the loop with ``defer`` so it becomes a
+    timer instead of a blocked thread.
+    """
+
+    max_request_size = 64 * 1024
+
+    def __init__(self, *args, **kwargs) -> None:
+        # loop state exists before binding, so server_close works even if bind fails
+        self._selector = selectors.DefaultSelector()
+        self._timers: list = []
+        self._timer_seq = itertools.count()
+        self._running = False
+        self._stopped = threading.Event()
+        self._stopped.set()
+        super().__init__(*args, **kwargs)
+
+    def server_activate(self) -> None:
+        super().server_activate()
+        self.socket.setblocking(False)
+        self._selector.register(self.socket, selectors.EVENT_READ, None)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self._running = True
+        self._stopped.clear()
+        try:
+            while self._running:
+                timeout = poll_interval
+                if self._timers:
+                    timeout = min(timeout, max(0.0, self._timers[0][0] - time.monotonic()))
+                for key, events in self._selector.select(timeout):
+                    if key.data is None:
+                        self._accept()
+                    elif events & selectors.EVENT_READ:
+                        self._on_readable(key.data)
+                    else:
+                        self._on_writable(key.data)
+                self._run_timers()
+                self.service_actions()
+        finally:
+            for key in list(self._selector.get_map().values()):
+                if key.data is not None:
+                    self._close(key.data)
+            for _, _, conn, _ in self._timers:
+                self._close(conn)
+            self._timers.clear()
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        self._running = False
+        self._stopped.wait()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._selector.close()
+
+    def defer(self, conn: _Connection, delay: float, callback: Callable[[], None]) -> None:
+        """Run callback on the loop after delay seconds; the response is held until then."""
+        conn.pending += 1
+        heapq.heappush(self._timers, (time.monotonic() + delay, next(self._timer_seq), conn, callback))
+
+    def _run_timers(self) -> None:
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, conn, callback = heapq.heappop(self._timers)
+            try:
+                callback()
+            except Exception:
+                self.handle_error(conn, conn.addr)  # type: ignore[arg-type]
+            conn.pending -= 1
+            if not conn.pending:
+                self._start_write(conn)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, addr = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            sock.setblocking(False)
+            self._selector.register(sock, selectors.EVENT_READ, _Connection(sock, addr))
+
+    def _on_readable(self, conn: _Connection) -> None:
+        try:
+            data = conn.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        if not data or len(conn.inbuf) + len(data) > self.max_request_size:
+            self._close(conn)
+            return
+        conn.inbuf += data
+        if _request_complete(conn.inbuf):
+            self._selector.unregister(conn.sock)
+            self._dispatch(conn)
+
+    def _dispatch(self, conn: _Connection) -> None:
+        try:
+            self.finish_request(conn, conn.addr)  # type: ignore[arg-type]
+        except Exception:
+            self.handle_error(conn, conn.addr)  # type: ignore[arg-type]
+        if not conn.pending:
+            self._start_write(conn)
+
+    def _start_write(self, conn: _Connection) -> None:
+        if not conn.outbuf:
+            self._close(conn)
+            return
+        self._selector.register(conn.sock, selectors.EVENT_WRITE, conn)
+        self._on_writable(conn)
+
+    def _on_writable(self, conn: _Connection) -> None:
+        try:
+            conn.sent += conn.sock.send(memoryview(conn.outbuf)[conn.sent:])
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        if conn.sent >= len(conn.outbuf):
+            self._close(conn)
+
+    def _close(self, conn: _Connection) -> None:
+        try:
+            self._selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
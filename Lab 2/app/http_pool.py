@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import http.client
+import queue
+import threading
+
+
+_scratch = threading.local()
+
+
+def _drain(resp: http.client.HTTPResponse) -> None:
+    """Read and discard the body into a reused per-thread buffer (no per-request bytes objects)"""
+    buf = getattr(_scratch, "buf", None)
+    if buf is None:
+        buf = _scratch.buf = memoryview(bytearray(64 * 1024))
+    while resp.readinto(buf):
+        pass
+
+
+class ConnectionPool:
+    """
+    Small pool of keep-alive ``http.client`` connections to one host.
+
+    Connections are handed back after each response instead of being closed,
+    so repeated requests skip the TCP handshake. A reused connection that the
+    server has meanwhile closed is retried once on a fresh one. Shared by the
+    server's /api/fire fan-out and every client script.
+    """
+
+    def __init__(self, host: str, port: int, maxsize: int = 64, timeout: float = 30.0) -> None:
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize)
+
+    def _new(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new(), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def warm(self, path: str, count: int) -> None:
+        """Open up to count connections ahead of a run and keep the ones the server leaves open"""
+        # HEAD skips the handler delay, rate limit and counters that GET goes through;
+        # send all of them before reading any so they are distinct connections
+        conns = []
+        for _ in range(min(count, self.maxsize)):
+            conn = self._new()
+            try:
+                conn.request("HEAD", path)
+            except OSError:
+                conn.close()
+                break
+            conns.append(conn)
+        for conn in conns:
+            try:
+                resp = conn.getresponse()
+                resp.read()
+            except Exception:
+                conn.close()
+                continue
+            if resp.will_close:
+                conn.close()  # e.g. an HTTP/1.0 server: nothing to keep
+                continue
+            self._release(conn)
+
+    def get_status(self, path: str) -> int:
+        """GET path, drain the body and return the status code."""
+        conn, reused = self._acquire()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            if resp.will_close:
+                # only the status is needed; drop the connection without reading the body
+                conn.close()
+                return resp.status
+            _drain(resp)  # the connection can only carry the next request once the body is consumed
+        except ConnectionError:  # includes RemoteDisconnected and BrokenPipeError
+            conn.close()
+            if not reused:
+                raise
+            return self.get_status(path)  # server closed an idle connection; retry on a fresh one
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn)
+        return resp.status
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
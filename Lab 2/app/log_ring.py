@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import List
+
+
+class LogRing:
+    """
+    Fixed-size ring of recent request log entries, kept as JSON bytes.
+
+    Entries get consecutive ids (1, 2, 3, ...), so entry ``n`` always lives in
+    slot ``(n - 1) % size`` and a ``since`` query maps straight to a slot range
+    instead of scanning the whole buffer. Each entry is encoded once when it is
+    logged; the id of every slot is kept in a parallel array so readers can
+    tell reused slots apart without decoding. The lock only covers the id
+    counter and the slot write; readers copy the slots after releasing it.
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self._size = size
+        self._slots: List[bytes] = [b""] * size
+        self._ids = array("q", [0]) * size
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        return self._seq
+
+    def append(self, data: bytes) -> int:
+        """Store a JSON object under the next id (added as its first key) and return that id."""
+        rest = data[1:].lstrip()
+        rest = b"}" if rest == b"}" else b", " + rest
+        with self._lock:
+            self._seq += 1
+            slot = (self._seq - 1) % self._size
+            # id before data: a reader that sees the new bytes also sees the new id
+            self._ids[slot] = self._seq
+            self._slots[slot] = b'{"id": %d%s' % (self._seq, rest)
+            return self._seq
+
+    def clear(self) -> None:
+        """Drop every stored entry; ids keep counting from where they were."""
+        with self._lock:
+            self._ids = array("q", [0]) * self._size
+            self._slots = [b""] * self._size
+
+    def since(self, since: int = 0, last: int = 100) -> List[bytes]:
+        """Entries with id > since, or the newest ``last`` entries when since is 0."""
+        with self._lock:
+            end = self._seq
+            slots, ids = self._slots, self._ids
+        oldest = max(1, end - self._size + 1)
+        start = max(since + 1, oldest) if since > 0 else max(oldest, end - last + 1)
+        items = []
+        for i in range(start, end + 1):
+            k = (i - 1) % self._size
+            data = slots[k]
+            # a writer may have lapped the ring since we read end; skip reused slots
+            if ids[k] == i:
+                items.append(data)
+        return items
+
+    def since_json(self, since: int = 0, last: int = 100) -> bytes:
+        """Same entries as ``since``, joined into one JSON array."""
+        return b"[" + b",".join(self.since(since, last)) + b"]"
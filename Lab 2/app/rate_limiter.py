@@ -2,14 +2,7 @@ from __future__ import annotations
 
 import threading
 import time
-from dataclasses import dataclass
-from typing import Dict
-
-
-@dataclass
-class _Bucket:
-    tokens: float
-    last_refill: float
+from typing import Dict, List
 
 
 class RateLimiter:
@@ -18,8 +11,21 @@ class RateLimiter:
 
     - rps: refill rate tokens/second
     - burst: bucket capacity
+
+    Each bucket is stored as a single float, the time at which it will be full
+    again (the "theoretical arrival time" form of a token bucket): a request
+    is allowed while that time is at most ``(burst - 1) / rps`` ahead of now,
+    and each allowed request pushes it ``1 / rps`` further. This gives the same
+    decisions as tracking tokens and a refill timestamp, with one dict lookup
+    and no per-bucket object.
+
+    Buckets are spread over ``stripes`` independently locked shards (picked by
+    ``hash(ip)``), so requests from different clients rarely wait on the same
+    lock.
     """
 
+    stripes = 16
+
     def __init__(self, rps: float = 5.0, burst: int = 10):
         if rps <= 0:
             raise ValueError("rps must be positive")
@@ -27,22 +33,21 @@ class RateLimiter:
             raise ValueError("burst must be positive")
         self._rps = float(rps)
         self._burst = float(burst)
-        self._buckets: Dict[str, _Bucket] = {}
-        self._lock = threading.RLock()
+        self._interval = 1.0 / self._rps
+        self._slack = (self._burst - 1.0) * self._interval
+        self._buckets: List[Dict[str, float]] = [{} for _ in range(self.stripes)]
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
 
     def allow(self, ip: str) -> bool:
         now = time.monotonic()
-        with self._lock:
-            bucket = self._buckets.get(ip)
-            if bucket is None:
-                bucket = _Bucket(tokens=self._burst, last_refill=now)
-                self._buckets[ip] = bucket
-            # Refill tokens based on elapsed time
-            elapsed = now - bucket.last_refill
-            if elapsed > 0:
-                bucket.tokens = min(self._burst, bucket.tokens + elapsed * self._rps)
-                bucket.last_refill = now
-            if bucket.tokens >= 1.0:
-                bucket.tokens -= 1.0
-                return True
-            return False
+        i = hash(ip) % self.stripes
+        buckets = self._buckets[i]
+        with self._locks[i]:
+            # a bucket that is already full (or new) starts from now
+            full_at = buckets.get(ip, now)
+            if full_at < now:
+                full_at = now
+            if full_at - now > self._slack:
+                return False
+            buckets[ip] = full_at + self._interval
+            return True
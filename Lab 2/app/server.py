@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import io
 import os
 import socket
 import sys
@@ -11,13 +13,20 @@ from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer, HTTPServe
 from typing import Optional
 from functools import partial
 import json
-from collections import deque
-from urllib.parse import urlsplit
+from urllib.parse import parse_qs, urlsplit
 
-from .counter import NaiveCounter, LockedCounter
+from .counter import NaiveCounter, LockedCounter, ShardedCounter
+from .event_server import EventLoopHTTPServer
+from .http_pool import ConnectionPool
+from .log_ring import LogRing
 from .rate_limiter import RateLimiter
 
 
+# constant API replies, encoded once
+_PING_BODY = json.dumps({"ok": True}).encode("utf-8")
+_RESET_BODY = json.dumps({"reset": True}).encode("utf-8")
+
+
 def getenv_float(name: str, default: float) -> float:
     try:
         return float(os.getenv(name, default))
@@ -40,26 +49,61 @@ class Config:
         self.counter_mode = os.getenv("COUNTER_MODE", "locked")  # naive or locked
         self.rps = getenv_float("RATE_LIMIT_RPS", 5.0)
         self.burst = getenv_int("RATE_LIMIT_BURST", 10)
-        self.server_type = os.getenv("SERVER_TYPE", "threaded")  # single or threaded
+        self.server_type = os.getenv("SERVER_TYPE", "threaded")  # single, threaded or evented
         self.trust_xff = os.getenv("TRUST_XFF", "false").lower() in {"1", "true", "yes"}
 
 
+def _make_fire_executor() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(max_workers=64, thread_name_prefix="fire")
+
+
+def server_kind(httpd: HTTPServer) -> str:
+    if isinstance(httpd, ThreadingHTTPServer):
+        return "threaded"
+    if isinstance(httpd, EventLoopHTTPServer):
+        return "evented"
+    return "single"
+
+
 class RequestHandler(SimpleHTTPRequestHandler):
     counter = None  # type: ignore
     limiter = None  # type: ignore
     delay = 1.0
-    inflight = 0
-    inflight_lock = threading.Lock()
-    # recent logs buffer
-    logs = deque(maxlen=1000)
-    logs_lock = threading.Lock()
-    log_seq = 0
+    # in-progress non-API requests, counted per thread (thread ident -> count).
+    # Each thread only touches its own key, so no lock is needed; readers sum.
+    _inflight_by_thread: dict[int, int] = {}
+    # recent logs buffer, only filled while the UI is polling /api/logs;
+    # otherwise entries go straight to stderr as JSON lines
+    logs = LogRing(1000)
+    logs_ui_window = 30.0
+    _logs_ui_alive_until = 0.0
+    # directory listings: path -> (st_mtime_ns, entries)
+    _index_cache: dict[str, tuple[int, list[str]]] = {}
+    _index_cache_lock = threading.Lock()
+    _index_cache_size = 64
+    # worker threads for /api/fire, created once per server
+    _fire_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    _fire_pool: Optional[ConnectionPool] = None
+    # small replies go out in separate header/body writes; without TCP_NODELAY
+    # Nagle + delayed ACK can hold each one back by ~40 ms
+    disable_nagle_algorithm = True
+    send_buffer_size = 1 << 20
+
+    def setup(self) -> None:
+        super().setup()  # sets TCP_NODELAY via disable_nagle_algorithm
+        try:
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        except OSError:
+            pass  # keep the kernel default if the size is refused
 
     # Reduce noisy logging
     def log_message(self, format: str, *args) -> None:  # noqa: A003 - name from base class
         sys.stderr.write("%s - - [%s] %s\n" % (self.address_string(), self.log_date_time_string(), format % args))
 
     def do_GET(self) -> None:  # noqa: N802 - base class method name
+        # split path and query once; everything below reuses these
+        self._path_nq, _, self._query = self.path.partition("?")
+
         # Determine client IP (optionally trust X-Forwarded-For for local testing)
         hdr_xff = self.headers.get("X-Forwarded-For")
         if getattr(self, "trust_xff", False) and hdr_xff:
@@ -76,11 +120,7 @@ class RequestHandler(SimpleHTTPRequestHandler):
                 p = urlsplit(k).path
                 data[p] = data.get(p, 0) + v
             body = json.dumps(data, ensure_ascii=False).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+            self._send_json(body)
             return
 
         # Simple JSON API for UI
@@ -99,13 +139,35 @@ class RequestHandler(SimpleHTTPRequestHandler):
         start = time.monotonic()
         self._inflight_inc()
         self._last_status = None  # type: ignore[attr-defined]
+
+        # simulate work; an event-loop server turns the delay into a timer
+        # instead of blocking its only thread
+        defer = getattr(self.server, "defer", None)
+        if defer is not None and self.delay > 0:
+            self._deferred = True
+            defer(self.request, self.delay, lambda: self._finish_deferred(ip, start))
+            return
+        time.sleep(self.delay)
+        self._serve_get(ip, start)
+
+    def _finish_deferred(self, ip: str, start: float) -> None:
+        self._deferred = False
         try:
-            # simulate work
-            time.sleep(self.delay)
+            self._serve_get(ip, start)
+        finally:
+            self.finish()
 
+    def finish(self) -> None:
+        # deferred requests are finished by _finish_deferred once the delay elapsed
+        if getattr(self, "_deferred", False):
+            return
+        super().finish()
+
+    def _serve_get(self, ip: str, start: float) -> None:
+        try:
             # increment per-file counter (path as key)
             # normalize to path-only (ignore query) so cache-busting params don't fragment counts
-            key = urlsplit(self.path).path
+            key = self._path_nq
             if self.counter:
                 self.counter.inc(key)
 
@@ -153,153 +215,189 @@ class RequestHandler(SimpleHTTPRequestHandler):
             pass
         return super().end_headers()
 
-    def _handle_api(self, ip: str) -> None:
-        # /api/ping -> { ok: true }
-        if self.path.startswith("/api/ping"):
-            body = json.dumps({"ok": True}).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-            return
-
-        # /api/info -> config snapshot
-        if self.path.startswith("/api/info"):
-            data = {
-                "delay": self.delay,
-                "counter_mode": type(self.counter).__name__ if self.counter else None,
-                "rps": getattr(self.limiter, "_rps", None),
-                "burst": getattr(self.limiter, "_burst", None),
-                "server": "threaded" if isinstance(self.server, ThreadingHTTPServer) else "single",
-            }
-            body = json.dumps(data).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-            return
-
-        # /api/reset -> clear counters
-        if self.path.startswith("/api/reset"):
-            if self.counter:
-                try:
-                    self.counter.reset()
-                except Exception:
-                    pass
-            body = json.dumps({"reset": True}).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-            return
+    def copyfile(self, source, outputfile) -> None:  # type: ignore[override]
+        # regular files on a real socket go out via sendfile: the kernel copies
+        # page cache -> socket and the bytes never pass through Python
+        if outputfile is self.wfile and isinstance(self.connection, socket.socket):
+            try:
+                source.fileno()
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                pass
+            else:
+                outputfile.flush()
+                self.connection.sendfile(source)
+                return
+        super().copyfile(source, outputfile)
 
-        # /api/counter -> current counts (normalized by path)
-        if self.path.startswith("/api/counter"):
-            snap = self.counter.snapshot() if self.counter else {}
-            data: dict[str, int] = {}
-            for k, v in snap.items():
-                p = urlsplit(k).path
-                data[p] = data.get(p, 0) + v
-            body = json.dumps(data).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
-            return
+    def _send_json(self, body: bytes) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-        # /api/inflight -> number of in-progress non-API requests
-        if self.path.startswith("/api/inflight"):
-            with type(self).inflight_lock:
-                n = type(self).inflight
-            body = json.dumps({"inflight": n}).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+    def _handle_api(self, ip: str) -> None:
+        # /api/<name>[/...][?query] -> one dict lookup instead of a startswith chain
+        name = self._path_nq[len("/api/"):].split("/", 1)[0]
+        route = self._API_ROUTES.get(name)
+        if route is None:
+            # Fallback 404
+            self.send_error(HTTPStatus.NOT_FOUND, "Unknown API path")
             return
-
-        # /api/logs?since=<id>&last=<n> -> recent logs
-        if self.path.startswith("/api/logs"):
-            from urllib.parse import urlparse, parse_qs
-            q = parse_qs(urlparse(self.path).query)
+        route(self)
+
+    # /api/ping -> { ok: true }
+    def _api_ping(self) -> None:
+        self._send_json(_PING_BODY)
+
+    # /api/info -> config snapshot
+    def _api_info(self) -> None:
+        data = {
+            "delay": self.delay,
+            "counter_mode": type(self.counter).__name__ if self.counter else None,
+            "rps": getattr(self.limiter, "_rps", None),
+            "burst": getattr(self.limiter, "_burst", None),
+            "server": server_kind(self.server),
+        }
+        body = json.dumps(data).encode("utf-8")
+        self._send_json(body)
+
+    # /api/reset -> clear counters
+    def _api_reset(self) -> None:
+        if self.counter:
             try:
-                since = int(q.get("since", ["0"])[0])
-            except ValueError:
-                since = 0
-            try:
-                last = int(q.get("last", ["100"])[0])
-            except ValueError:
-                last = 100
-            last = max(1, min(500, last))
-            with type(self).logs_lock:
-                items = list(type(self).logs)
-            if since > 0:
-                items = [e for e in items if e.get("id", 0) > since]
-            else:
-                items = items[-last:]
-            body = json.dumps(items).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+                self.counter.reset()
+            except Exception:
+                pass
+        self._send_json(_RESET_BODY)
+
+    # /api/counter -> current counts (normalized by path)
+    def _api_counter(self) -> None:
+        snap = self.counter.snapshot() if self.counter else {}
+        data: dict[str, int] = {}
+        for k, v in snap.items():
+            p = urlsplit(k).path
+            data[p] = data.get(p, 0) + v
+        body = json.dumps(data).encode("utf-8")
+        self._send_json(body)
+
+    # /api/inflight -> number of in-progress non-API requests
+    def _api_inflight(self) -> None:
+        body = json.dumps({"inflight": self._inflight_peek()}).encode("utf-8")
+        self._send_json(body)
+
+    # /api/logs?since=<id>&last=<n> -> recent logs
+    def _api_logs(self) -> None:
+        q = parse_qs(self._query)
+        try:
+            since = int(q.get("since", ["0"])[0])
+        except ValueError:
+            since = 0
+        try:
+            last = int(q.get("last", ["100"])[0])
+        except ValueError:
+            last = 100
+        last = max(1, min(500, last))
+        cls = type(self)
+        now = time.monotonic()
+        if now > cls._logs_ui_alive_until:
+            # UI (re)attached: entries from the idle period never reached the ring
+            cls.logs.clear()
+        cls._logs_ui_alive_until = now + cls.logs_ui_window
+        self._send_json(cls.logs.since_json(since, last))
+
+    # /api/fire?path=/index.html&n=20 -> server-side generator of N requests (useful to visualize concurrency)
+    def _api_fire(self) -> None:
+        if server_kind(self.server) == "single":
+            # one request at a time: the fan-out back to ourselves could never be answered
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, "/api/fire needs the threaded or evented server")
             return
-
-        # /api/fire?path=/index.html&n=20 -> server-side generator of N requests (useful to visualize concurrency)
-        if self.path.startswith("/api/fire"):
-            from urllib.parse import urlparse, parse_qs
-            q = parse_qs(urlparse(self.path).query)
-            path = q.get("path", ["/"])[0]
+        q = parse_qs(self._query)
+        path = q.get("path", ["/"])[0]
+        try:
+            n = int(q.get("n", ["10"])[0])
+        except ValueError:
+            n = 10
+        # Fire concurrent requests to our own server using the shared pool,
+        # over keep-alive connections that survive between calls
+        pool = type(self)._fire_pool
+        if pool is None or pool.port != self.server.server_port:
+            pool = type(self)._fire_pool = ConnectionPool("127.0.0.1", self.server.server_port)
+        def fetch(p: str) -> int:
             try:
-                n = int(q.get("n", ["10"])[0])
-            except ValueError:
-                n = 10
-            # Fire concurrent requests to our own server using threads
-            import concurrent.futures, urllib.request
-            url = f"http://127.0.0.1:{self.server.server_port}{path}"
-            def fetch(u: str) -> int:
+                return pool.get_status(p)
+            except Exception:
+                return -1
+        ex = type(self)._fire_executor
+        if ex is None:  # handler used without make_server
+            ex = type(self)._fire_executor = _make_fire_executor()
+        futures = [ex.submit(fetch, path) for _ in range(n)]
+        defer = getattr(self.server, "defer", None)
+        if defer is not None:
+            # the event loop has to keep running to answer these requests itself,
+            # so poll for completion with timers instead of blocking its only thread
+            self._deferred = True
+            def poll() -> None:
+                if not all(f.done() for f in futures):
+                    defer(self.request, 0.01, poll)
+                    return
+                self._deferred = False
                 try:
-                    with urllib.request.urlopen(u) as r:
-                        return r.status
-                except Exception:
-                    return -1
-            oks = 0
-            with concurrent.futures.ThreadPoolExecutor(max_workers=min(64, n)) as ex:
-                for s in concurrent.futures.as_completed([ex.submit(fetch, url) for _ in range(n)]):
-                    if s.result() == 200:
-                        oks += 1
-            body = json.dumps({"requested": n, "ok": oks}).encode("utf-8")
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+                    self._send_fire_result(futures)
+                finally:
+                    self.finish()
+            defer(self.request, 0.01, poll)
             return
-
-        # Fallback 404
-        self.send_error(HTTPStatus.NOT_FOUND, "Unknown API path")
+        concurrent.futures.wait(futures)
+        self._send_fire_result(futures)
+
+    def _send_fire_result(self, futures: list[concurrent.futures.Future]) -> None:
+        oks = sum(1 for f in futures if f.result() == 200)
+        body = json.dumps({"requested": len(futures), "ok": oks}).encode("utf-8")
+        self._send_json(body)
+
+    _API_ROUTES = {
+        "ping": _api_ping,
+        "info": _api_info,
+        "reset": _api_reset,
+        "counter": _api_counter,
+        "inflight": _api_inflight,
+        "logs": _api_logs,
+        "fire": _api_fire,
+    }
 
     def _render_counts(self, counts: dict[str, int]) -> str:
         rows = "".join(f"<tr><td>{k}</td><td>{v}</td></tr>" for k, v in sorted(counts.items()))
         return f"<table border='1'><tr><th>Path</th><th>Count</th></tr>{rows}</table>"
 
+    @classmethod
+    def _list_directory(cls, document_root: str) -> list[str]:
+        # entry names (dirs suffixed with '/'), cached until the directory's mtime changes
+        mtime = os.stat(document_root).st_mtime_ns
+        with cls._index_cache_lock:
+            cached = cls._index_cache.get(document_root)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        # scandir's DirEntry knows its type from the directory read, no stat per entry
+        with os.scandir(document_root) as it:
+            entries = [e.name + ('/' if e.is_dir() else '') for e in sorted(it, key=lambda e: e.name)]
+        with cls._index_cache_lock:
+            if document_root not in cls._index_cache and len(cls._index_cache) >= cls._index_cache_size:
+                cls._index_cache.pop(next(iter(cls._index_cache)))
+            cls._index_cache[document_root] = (mtime, entries)
+        return entries
+
     def _serve_custom_index(self, counts: dict[str, int], document_root: str) -> None:
         # list files in document_root
         try:
-            items = sorted(os.listdir(document_root))
+            items = self._list_directory(document_root)
         except OSError:
             self.send_error(HTTPStatus.NOT_FOUND, "Directory not found")
             return
         links = []
         # ensure base path ends with '/'
         base = self.path if self.path.endswith('/') else self.path + '/'
-        for name in items:
-            path = name + ('/' if os.path.isdir(os.path.join(document_root, name)) else '')
+        for path in items:
             href = base + path
             c = counts.get(href, 0)
             links.append(f"<li><a href='{href}'>{path}</a> — requests: {c}</li>")
@@ -321,38 +419,51 @@ class RequestHandler(SimpleHTTPRequestHandler):
         self.wfile.write(body_bytes)
 
     def _inflight_inc(self) -> None:
-        with type(self).inflight_lock:
-            type(self).inflight += 1
+        shards = RequestHandler._inflight_by_thread
+        ident = threading.get_ident()
+        shards[ident] = shards.get(ident, 0) + 1
 
     def _inflight_dec(self) -> None:
-        with type(self).inflight_lock:
-            if type(self).inflight > 0:
-                type(self).inflight -= 1
+        shards = RequestHandler._inflight_by_thread
+        ident = threading.get_ident()
+        n = shards.get(ident, 0)
+        if n > 1:
+            shards[ident] = n - 1
+        elif n == 1:
+            del shards[ident]  # keep the dict to threads that are busy right now
 
     def _inflight_peek(self) -> int:
-        with type(self).inflight_lock:
-            return type(self).inflight
+        # list() copies the values in one C-level step, safe against concurrent writers
+        return sum(list(RequestHandler._inflight_by_thread.values()))
 
     def _log(self, *, ip: str, method: str, path: str, status: int, dur_ms: float, inflight: int) -> None:
-        with type(self).logs_lock:
-            type(self).log_seq += 1
-            entry = {
-                "id": type(self).log_seq,
-                "ts": time.time(),
-                "ip": ip,
-                "method": method,
-                "path": path,
-                "status": status,
-                "dur_ms": round(dur_ms, 2),
-                "inflight": inflight,
-                "thread": threading.current_thread().name,
-            }
-            type(self).logs.append(entry)
+        entry = {
+            "ts": time.time(),
+            "ip": ip,
+            "method": method,
+            "path": path,
+            "status": status,
+            "dur_ms": round(dur_ms, 2),
+            "inflight": inflight,
+            "thread": threading.current_thread().name,
+        }
+        line = json.dumps(entry)
+        if time.monotonic() > type(self)._logs_ui_alive_until:
+            sys.stderr.write(line + "\n")
+            return
+        # encoded once here; /api/logs only joins the stored bytes
+        type(self).logs.append(line.encode("utf-8"))
 
 
 def make_server(cfg: Config) -> tuple[HTTPServer, type[RequestHandler]]:
     # Choose counter
-    counter = NaiveCounter() if cfg.counter_mode == "naive" else LockedCounter()
+    if cfg.counter_mode == "naive":
+        counter = NaiveCounter()
+    elif cfg.server_type == "evented":
+        # one long-lived loop thread: per-thread shards skip the lock on most increments
+        counter = ShardedCounter()
+    else:
+        counter = LockedCounter()
     # Limiter
     limiter = RateLimiter(cfg.rps, cfg.burst)
 
@@ -365,17 +476,34 @@ def make_server(cfg: Config) -> tuple[HTTPServer, type[RequestHandler]]:
     Handler.delay = cfg.delay  # type: ignore[attr-defined]
     Handler.directory = cfg.doc_root  # type: ignore[attr-defined]
     Handler.trust_xff = cfg.trust_xff  # type: ignore[attr-defined]
+    Handler._fire_executor = _make_fire_executor()
 
     # Ensure handler serves from configured directory by passing it explicitly
     handler_factory = partial(Handler, directory=cfg.doc_root)
 
     if cfg.server_type == "threaded":
-        httpd: HTTPServer = ThreadingHTTPServer(("0.0.0.0", cfg.port), handler_factory)
+        # keep-alive only where an idle connection just parks its own thread;
+        # the single and evented servers answer HTTP/1.0 and close after each response
+        Handler.protocol_version = "HTTP/1.1"
+        Handler.timeout = 15  # drop idle keep-alive connections
+        server_cls: type[HTTPServer] = ThreadingHTTPServer
+    elif cfg.server_type == "evented":
+        server_cls = EventLoopHTTPServer
     else:
-        httpd = HTTPServer(("0.0.0.0", cfg.port), handler_factory)
+        server_cls = HTTPServer
 
+    # bind and listen by hand so the backlog can be raised first: the default of 5
+    # drops SYNs during bursts of concurrent clients, costing a 1 s retransmit
+    httpd = server_cls(("0.0.0.0", cfg.port), handler_factory, bind_and_activate=False)
+    httpd.request_queue_size = 1024
     # Allow quick restarts
     httpd.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        httpd.server_bind()
+        httpd.server_activate()
+    except BaseException:
+        httpd.server_close()
+        raise
     return httpd, Handler
 
 
@@ -387,7 +515,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     parser.add_argument("--counter", choices=["naive", "locked"], default=os.getenv("COUNTER_MODE", "locked"))
     parser.add_argument("--rps", type=float, default=float(os.getenv("RATE_LIMIT_RPS", 5.0)))
     parser.add_argument("--burst", type=int, default=int(os.getenv("RATE_LIMIT_BURST", 10)))
-    parser.add_argument("--server", choices=["single", "threaded"], default=os.getenv("SERVER_TYPE", "threaded"))
+    parser.add_argument("--server", choices=["single", "threaded", "evented"], default=os.getenv("SERVER_TYPE", "threaded"))
     args = parser.parse_args(argv)
 
     cfg = Config()
@@ -399,16 +527,20 @@ def main(argv: Optional[list[str]] = None) -> int:
     cfg.burst = args.burst
     cfg.server_type = args.server
 
-    httpd, _ = make_server(cfg)
+    httpd, handler = make_server(cfg)
 
-    server_kind = "Threaded" if cfg.server_type == "threaded" else "Single-threaded"
-    print(f"Starting {server_kind} HTTP server on port {cfg.port}, doc_root={cfg.doc_root}, counter={cfg.counter_mode}, rps={cfg.rps}/s, burst={cfg.burst}")
+    kind = {"threaded": "Threaded", "evented": "Event-loop"}.get(cfg.server_type, "Single-threaded")
+    print(f"Starting {kind} HTTP server on port {cfg.port}, doc_root={cfg.doc_root}, counter={cfg.counter_mode}, rps={cfg.rps}/s, burst={cfg.burst}")
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
         httpd.server_close()
+        if handler._fire_executor is not None:
+            handler._fire_executor.shutdown(wait=False, cancel_futures=True)
+        if handler._fire_pool is not None:
+            handler._fire_pool.close()
     return 0
 
 
@@ -1,30 +1,85 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import concurrent.futures
+import os
+import sys
+import threading
 import time
-import urllib.request
+from urllib.parse import urlsplit
 from typing import Tuple
 
+if __package__ in (None, ""):
+    # run as a script (python client/bench.py): make the app package importable
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from app.http_pool import ConnectionPool
+
+
+_pools: dict[Tuple[str, int], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(host: str, port: int) -> ConnectionPool:
+    # one keep-alive pool per host, shared by the worker threads across runs
+    with _pools_lock:
+        pool = _pools.get((host, port))
+        if pool is None:
+            pool = _pools[(host, port)] = ConnectionPool(host, port)
+        return pool
+
 
 def fetch(url: str) -> Tuple[int, float]:
     start = time.perf_counter()
+    u = urlsplit(url)
+    target = u.path or "/"
+    if u.query:
+        target += "?" + u.query
     try:
-        with urllib.request.urlopen(url) as resp:
-            status = resp.status
-            resp.read(64 * 1024)  # read a bit to ensure body consumed
+        status = _pool(u.hostname or "localhost", u.port or 80).get_status(target)
     except Exception:
         status = -1
     return status, time.perf_counter() - start
 
 
-def run_concurrent(url: str, n: int) -> Tuple[float, list[Tuple[int, float]]]:
+def run_concurrent(url: str, n: int, ex: concurrent.futures.Executor) -> Tuple[float, list[Tuple[int, float]]]:
+    # ex is created once per benchmark instead of per call
     t0 = time.perf_counter()
     results: list[Tuple[int, float]] = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=n) as ex:
-        futs = [ex.submit(fetch, url) for _ in range(n)]
-        for fut in concurrent.futures.as_completed(futs):
-            results.append(fut.result())
+    futs = [ex.submit(fetch, url) for _ in range(n)]
+    for fut in concurrent.futures.as_completed(futs):
+        results.append(fut.result())
+    total = time.perf_counter() - t0
+    return total, results
+
+
+async def afetch(host: str, port: int, target: str) -> Tuple[int, float]:
+    start = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        status = int((await reader.readline()).split(b" ", 2)[1])
+        await reader.read()  # drain until the server closes the connection
+    except Exception:
+        status = -1
+    finally:
+        if writer is not None:
+            writer.close()
+    return status, time.perf_counter() - start
+
+
+async def arun(url: str, n: int) -> list[Tuple[int, float]]:
+    u = urlsplit(url)
+    target = (u.path or "/") + ("?" + u.query if u.query else "")
+    return await asyncio.gather(*(afetch(u.hostname or "localhost", u.port or 80, target) for _ in range(n)))
+
+
+def run_async(url: str, n: int) -> Tuple[float, list[Tuple[int, float]]]:
+    # all n requests in flight on one event loop instead of n threads
+    t0 = time.perf_counter()
+    results = asyncio.run(arun(url, n))
     total = time.perf_counter() - t0
     return total, results
 
@@ -43,10 +98,15 @@ def main() -> int:
     p.add_argument("url", help="Target URL, e.g. http://localhost:8000/")
     p.add_argument("-n", "--num", type=int, default=10)
     p.add_argument("--mode", choices=["concurrent", "sequential"], default="concurrent")
+    p.add_argument("--engine", choices=["asyncio", "threads"], default="asyncio",
+                   help="How concurrent mode drives requests (default: asyncio)")
     args = p.parse_args()
 
-    if args.mode == "concurrent":
-        total, results = run_concurrent(args.url, args.num)
+    if args.mode == "concurrent" and args.engine == "asyncio":
+        total, results = run_async(args.url, args.num)
+    elif args.mode == "concurrent":
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.num) as ex:
+            total, results = run_concurrent(args.url, args.num, ex)
     else:
         total, results = run_sequential(args.url, args.num)
 
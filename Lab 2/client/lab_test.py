@@ -10,100 +10,368 @@ This script implements the exact test described in the lab requirements:
 """
 
 import argparse
+import asyncio
+import atexit
+import errno
+from array import array
 import time
 import concurrent.futures
-import urllib.request
-import urllib.error
-from typing import List, Tuple
+import http.client
+import os
+import re
+import selectors
+import socket
+import sys
+import threading
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import urlsplit
 
+if __package__ in (None, ""):
+    # run as a script (python client/lab_test.py): make the app package importable
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from app.http_pool import ConnectionPool
 
-def make_request(url: str, request_id: int) -> Tuple[int, float, int]:
+# Cleared by --no-emoji; _say() then maps the banner symbols to ASCII
+_emoji = True
+_ASCII_TAGS = {"✅": "[OK] ", "❌": "[FAIL] ", "⚠": "[WARN] ", "👍": "[OK] ", "→": "-> "}
+_NON_ASCII = re.compile(r"[^\x00-\x7f]+ *")
+
+
+def _say(text: str = "") -> None:
+    """Print a user-facing line, ASCII only when --no-emoji is set"""
+    if not _emoji:
+        text = _NON_ASCII.sub(lambda m: _ASCII_TAGS.get(m.group()[0], ""), text)
+    print(text)
+
+
+def _split_url(url: str) -> Tuple[str, int, str]:
+    """Parse url once into (host, port, path-with-query) for the workers"""
+    u = urlsplit(url)
+    path = (u.path or "/") + ("?" + u.query if u.query else "")
+    return u.hostname or "localhost", u.port or 80, path
+
+
+# default thread cap for the threads engine, so a large --requests run does not
+# start one OS thread per request
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 5)
+# connections the asyncio engine keeps in flight at once
+DEFAULT_CONNECTION_LIMIT = 100
+# seconds one request may take before it counts as failed, as urlopen(timeout=30) did
+REQUEST_TIMEOUT = 30.0
+
+
+def make_request(pool: ConnectionPool, path: str, request_id: int) -> Tuple[int, float, int]:
     """Make a single HTTP request and return (request_id, duration, status_code)"""
-    start = time.time()
+    start = time.perf_counter()
     try:
-        with urllib.request.urlopen(url, timeout=30) as response:
-            status = response.status
-    except urllib.error.HTTPError as e:
-        status = e.code
+        status = pool.get_status(path)
     except Exception:
         status = 0  # Connection error
     
-    duration = time.time() - start
+    duration = time.perf_counter() - start
     return request_id, duration, status
 
 
-def test_concurrent_requests(url: str, num_requests: int = 10) -> dict:
-    """Make concurrent requests and measure performance"""
-    print(f"🚀 Starting {num_requests} CONCURRENT requests to {url}")
-    
-    start_time = time.time()
-    results = []
-    
-    # Use ThreadPoolExecutor to make truly concurrent requests
-    with concurrent.futures.ThreadPoolExecutor(max_workers=num_requests) as executor:
-        # Submit all requests at once
-        futures = [
-            executor.submit(make_request, url, i+1) 
-            for i in range(num_requests)
-        ]
+async def _aget_status(host: str, port: int, path: str) -> int:
+    """GET path on a fresh connection and return the status once the body is drained"""
+    writer = None
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        status = int((await reader.readline()).split(b" ", 2)[1])
+        await reader.read()  # drain until the server closes the connection
+        return status
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def _afetch(host: str, port: int, path: str, request_id: int, limit: asyncio.Semaphore,
+                  timeout: float = REQUEST_TIMEOUT) -> Tuple[int, float, int]:
+    """Async version of make_request: one connection per request on the event loop"""
+    async with limit:
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(_aget_status(host, port, path), timeout)
+        except Exception:
+            status = 0  # Connection error or timeout
         
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(futures):
-            results.append(future.result())
-    
-    total_time = time.time() - start_time
+        duration = time.perf_counter() - start
+    return request_id, duration, status
+
+
+async def _arun(url: str, num_requests: int, limit: int = DEFAULT_CONNECTION_LIMIT,
+                timeout: float = REQUEST_TIMEOUT) -> List[Tuple[int, float, int]]:
+    host, port, path = _split_url(url)
+    # at most `limit` connections open at once, like aiohttp's TCPConnector(limit=...)
+    sem = asyncio.Semaphore(max(1, limit))
+    return list(await asyncio.gather(*(_afetch(host, port, path, i+1, sem, timeout) for i in range(num_requests))))
+
+
+class RequestTimes:
+    """Per-request results as two flat arrays; slot i belongs to request i+1"""
+    __slots__ = ("durations", "statuses")
+
+    def __init__(self, num_requests: int):
+        self.durations = array("d", bytes(8 * num_requests))
+        self.statuses = array("i", bytes(4 * num_requests))
+
+    def record(self, request_id: int, duration: float, status: int) -> None:
+        self.durations[request_id - 1] = duration
+        self.statuses[request_id - 1] = status
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def __iter__(self) -> Iterator[Tuple[int, float, int]]:
+        """(request_id, duration, status) rows in request order, built on the fly"""
+        for i, (duration, status) in enumerate(zip(self.durations, self.statuses)):
+            yield i + 1, duration, status
+
+
+class _Pending:
+    """State of one in-flight request in the selectors engine"""
+    __slots__ = ("index", "start", "unsent", "head")
+
+    def __init__(self, index: int, start: float, request: bytes):
+        self.index = index
+        self.start = start
+        self.unsent = request
+        self.head = b""  # first bytes of the reply, enough for the status line
+
+
+# connect_ex results meaning "connection under way"; Windows reports WSAEWOULDBLOCK (10035)
+_CONNECT_PENDING = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", None))
+
+
+def _run_selectors(url: str, num_requests: int, timeout: float = 30.0) -> RequestTimes:
+    """One thread, non-blocking sockets: start every connection, then serve whichever is ready"""
+    host, port, path = _split_url(url)
+    family, _, _, _, addr = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]  # resolve once
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode("latin-1")
+    buf = memoryview(bytearray(64 * 1024))  # one receive buffer shared by all connections
+    results = RequestTimes(num_requests)
+    sel = selectors.DefaultSelector()
     
-    # Sort by request_id for display
-    results.sort(key=lambda x: x[0])
+    def finish(sock, p, status):
+        sel.unregister(sock)
+        sock.close()
+        results.record(p.index + 1, time.perf_counter() - p.start, status)
     
-    # Analyze results
-    successful = [r for r in results if r[2] == 200]
-    failed = [r for r in results if r[2] != 200]
+    try:
+        for i in range(num_requests):
+            p = _Pending(i, time.perf_counter(), request)
+            try:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+            except OSError:
+                # e.g. EMFILE when N is above the open-file limit: count it, keep going
+                results.record(i + 1, time.perf_counter() - p.start, 0)
+                continue
+            try:
+                sock.setblocking(False)
+                err = sock.connect_ex(addr)
+                if err not in _CONNECT_PENDING:
+                    raise OSError(err, os.strerror(err))
+                sel.register(sock, selectors.EVENT_WRITE, p)
+            except OSError:
+                sock.close()
+                results.record(i + 1, time.perf_counter() - p.start, 0)  # Connection error
+        
+        while sel.get_map():
+            ready = sel.select(timeout)
+            if not ready:
+                break  # nothing moved for timeout seconds; the rest count as errors
+            for key, events in ready:
+                sock, p = key.fileobj, key.data
+                try:
+                    if events & selectors.EVENT_WRITE:
+                        if p.unsent is request and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                            finish(sock, p, 0)  # connect failed
+                            continue
+                        p.unsent = p.unsent[sock.send(p.unsent):]
+                        if not p.unsent:
+                            sel.modify(sock, selectors.EVENT_READ, p)
+                        continue
+                    n = sock.recv_into(buf)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError:
+                    finish(sock, p, 0)
+                    continue
+                if n:
+                    if len(p.head) < 32:
+                        p.head += bytes(buf[:n])
+                    continue
+                # the server closed the connection: the whole reply has arrived
+                parts = p.head.split(b" ", 2)
+                finish(sock, p, int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0)
+    finally:
+        for key in list(sel.get_map().values()):
+            finish(key.fileobj, key.data, 0)
+        sel.close()
+    return results
+
+
+def _summarize(mode: str, total_time: float, num_requests: int, results: RequestTimes) -> dict:
+    """Build the result dict, counting successes and failures in one pass"""
+    ok = fail = 0
+    ok_time = 0.0
+    for duration, status in zip(results.durations, results.statuses):
+        if status == 200:
+            ok += 1
+            ok_time += duration
+        else:
+            fail += 1
     
     return {
-        'mode': 'CONCURRENT',
+        'mode': mode,
         'total_time': total_time,
         'num_requests': num_requests,
-        'successful': len(successful),
-        'failed': len(failed),
-        'avg_request_time': sum(r[1] for r in successful) / len(successful) if successful else 0,
+        'successful': ok,
+        'failed': fail,
+        'avg_request_time': ok_time / ok if ok else 0,
         'results': results
     }
 
 
+class BenchmarkContext:
+    """Thread pool and per-host connection pools shared by every run in one session"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, connection_limit: int = DEFAULT_CONNECTION_LIMIT):
+        self.max_workers = max(1, max_workers)
+        self.connection_limit = max(1, connection_limit)
+        # threads start lazily, so the asyncio and selectors engines never spawn any
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        self.pools: Dict[Tuple[str, int], ConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def pool_for(self, host: str, port: int) -> ConnectionPool:
+        with self._lock:
+            pool = self.pools.get((host, port))
+            if pool is None:
+                pool = self.pools[(host, port)] = ConnectionPool(host, port)
+            return pool
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+        for pool in self.pools.values():
+            pool.close()
+
+    def run(self, url: str, num_requests: int = 10, engine: str = "asyncio") -> dict:
+        """Make concurrent requests and measure performance"""
+        _say(f"🚀 Starting {num_requests} CONCURRENT requests to {url} ({engine})")
+        
+        if engine == "threads":
+            # the URL is parsed here once, not in every worker, and the pool gets
+            # one live connection per worker before the clock starts
+            host, port, path = _split_url(url)
+            pool = self.pool_for(host, port)
+            pool.warm(path, min(num_requests, self.max_workers))
+        
+        start_time = time.perf_counter()
+        
+        if engine == "asyncio":
+            # Up to connection_limit requests in flight on one event loop, no thread per request
+            results = RequestTimes(num_requests)
+            for row in asyncio.run(_arun(url, num_requests, self.connection_limit)):
+                results.record(*row)
+        elif engine == "selectors":
+            # Same idea without coroutines: one thread multiplexing raw sockets
+            results = _run_selectors(url, num_requests)
+        else:
+            # Sliding window over the shared, bounded thread pool: at most
+            # 2 * max_workers futures exist at once, however large num_requests is.
+            # Request i+1 lands in slot i, so no sort is needed.
+            executor = self.executor
+            results = RequestTimes(num_requests)
+            window = 2 * self.max_workers
+            inflight = set()
+            next_id = 1
+            while next_id <= num_requests or inflight:
+                while next_id <= num_requests and len(inflight) < window:
+                    inflight.add(executor.submit(make_request, pool, path, next_id))
+                    next_id += 1
+                done, inflight = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    results.record(*future.result())
+        
+        total_time = time.perf_counter() - start_time
+        
+        return _summarize('CONCURRENT', total_time, num_requests, results)
+
+    def run_sequential(self, url: str, num_requests: int = 10) -> dict:
+        """Make sequential requests and measure performance"""
+        _say(f"🐌 Starting {num_requests} SEQUENTIAL requests to {url}")
+        
+        host, port, path = _split_url(url)
+        pool = self.pool_for(host, port)
+        pool.warm(path, 1)
+        
+        start_time = time.perf_counter()
+        results = RequestTimes(num_requests)
+        
+        # Make requests one after another
+        for i in range(num_requests):
+            results.record(*make_request(pool, path, i+1))
+        
+        total_time = time.perf_counter() - start_time
+        
+        return _summarize('SEQUENTIAL', total_time, num_requests, results)
+
+
+def _probe(url: str, max_wait: float = 5.0) -> bool:
+    """Wait until url answers a HEAD with 200, backing off between tries; False after max_wait"""
+    host, port, path = _split_url(url)
+    t0 = time.perf_counter()
+    backoff = 0.05
+    while True:
+        conn = http.client.HTTPConnection(host, port, timeout=1)
+        try:
+            # HEAD: no handler delay, no rate-limit token and no counter bump on Lab 2
+            conn.request("HEAD", path)
+            if conn.getresponse().status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            conn.close()
+        if time.perf_counter() - t0 + backoff > max_wait:
+            return False
+        time.sleep(backoff)
+        backoff *= 1.5
+
+
+_default_context = None
+
+
+def _get_default_context() -> BenchmarkContext:
+    global _default_context
+    if _default_context is None:
+        _default_context = BenchmarkContext()
+    return _default_context
+
+
+def test_concurrent_requests(url: str, num_requests: int = 10, engine: str = "asyncio") -> dict:
+    """Make concurrent requests and measure performance (on a shared default context)"""
+    return _get_default_context().run(url, num_requests, engine)
+
+
 def test_sequential_requests(url: str, num_requests: int = 10) -> dict:
-    """Make sequential requests and measure performance"""
-    print(f"🐌 Starting {num_requests} SEQUENTIAL requests to {url}")
-    
-    start_time = time.time()
-    results = []
-    
-    # Make requests one after another
-    for i in range(num_requests):
-        result = make_request(url, i+1)
-        results.append(result)
-    
-    total_time = time.time() - start_time
-    
-    # Analyze results
-    successful = [r for r in results if r[2] == 200]
-    failed = [r for r in results if r[2] != 200]
-    
-    return {
-        'mode': 'SEQUENTIAL',
-        'total_time': total_time,
-        'num_requests': num_requests,
-        'successful': len(successful),
-        'failed': len(failed),
-        'avg_request_time': sum(r[1] for r in successful) / len(successful) if successful else 0,
-        'results': results
-    }
+    """Make sequential requests and measure performance (on a shared default context)"""
+    return _get_default_context().run_sequential(url, num_requests)
 
 
-def print_results(result: dict):
-    """Print formatted test results"""
+# runs larger than this only list individual requests with --verbose
+MAX_LISTED_REQUESTS = 100
+
+
+def print_results(result: dict, verbose: bool = False, quiet: bool = False):
+    """Print formatted test results (quiet: summary only; ASCII only under --no-emoji, like _say)"""
+    # the rows bypass _say (one write for all of them), so they pick their marks here
+    ok_mark, fail_mark = ("✅", "❌") if _emoji else ("OK", "FAIL")
     print(f"\n{'='*60}")
-    print(f"📊 {result['mode']} TEST RESULTS")
+    _say(f"📊 {result['mode']} TEST RESULTS")
     print(f"{'='*60}")
     print(f"Total Time:          {result['total_time']:.3f} seconds")
     print(f"Requests Made:       {result['num_requests']}")
@@ -112,75 +380,83 @@ def print_results(result: dict):
     print(f"Avg Request Time:    {result['avg_request_time']:.3f} seconds")
     print(f"Throughput:          {result['successful']/result['total_time']:.1f} req/sec")
     
-    print(f"\n📋 Individual Request Times:")
-    for req_id, duration, status in result['results']:
-        status_emoji = "✅" if status == 200 else "❌"
-        print(f"  Request {req_id:2d}: {duration:.3f}s - {status} {status_emoji}")
+    if quiet:
+        return
+    if not verbose and result['num_requests'] > MAX_LISTED_REQUESTS:
+        _say(f"\n📋 Individual Request Times: {result['num_requests']} requests, use --verbose to list them")
+        return
+    _say(f"\n📋 Individual Request Times:")
+    # one write for all rows instead of a print() per request
+    lines = [
+        f"  Request {req_id:2d}: {duration:.3f}s - {status} {ok_mark if status == 200 else fail_mark}"
+        for req_id, duration, status in result['results']
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def compare_lab_results(lab1_result: dict, lab2_result: dict, delay: float, num_requests: int):
     """Compare Lab 1 vs Lab 2 server performance"""
-    print(f"\n{'🔄 LAB 1 vs LAB 2 COMPARISON'}")
-    print(f"{'='*60}")
+    _say(f"\n{'🔄 LAB 1 vs LAB 2 COMPARISON'}")
+    _say(f"{'='*60}")
     
     speedup = lab1_result['total_time'] / lab2_result['total_time']
     
-    print(f"Lab 1 (Single-threaded): {lab1_result['total_time']:.3f}s")
-    print(f"Lab 2 (Multithreaded):   {lab2_result['total_time']:.3f}s")
-    print(f"Speedup Factor:          {speedup:.1f}x")
+    _say(f"Lab 1 (Single-threaded): {lab1_result['total_time']:.3f}s")
+    _say(f"Lab 2 (Multithreaded):   {lab2_result['total_time']:.3f}s")
+    _say(f"Speedup Factor:          {speedup:.1f}x")
     
     expected_lab1_time = num_requests * delay
     expected_lab2_time = delay * 1.5  # some overhead expected
     
-    print(f"\n📊 ANALYSIS:")
-    print(f"Expected Lab 1 time:     ~{expected_lab1_time:.1f}s (sequential processing)")
-    print(f"Expected Lab 2 time:     ~{expected_lab2_time:.1f}s (parallel processing)")
+    _say(f"\n📊 ANALYSIS:")
+    _say(f"Expected Lab 1 time:     ~{expected_lab1_time:.1f}s (sequential processing)")
+    _say(f"Expected Lab 2 time:     ~{expected_lab2_time:.1f}s (parallel processing)")
     
     lab1_ok = abs(lab1_result['total_time'] - expected_lab1_time) < expected_lab1_time * 0.3
     lab2_ok = lab2_result['total_time'] < expected_lab1_time * 0.5
     
-    print(f"\n🎯 RESULTS:")
+    _say(f"\n🎯 RESULTS:")
     if lab1_ok and lab2_ok and speedup > 3:
-        print("✅ PERFECT: Lab 1 shows sequential behavior, Lab 2 shows parallel speedup!")
-        print("   This proves the difference between single-threaded and multithreaded servers.")
+        _say("✅ PERFECT: Lab 1 shows sequential behavior, Lab 2 shows parallel speedup!")
+        _say("   This proves the difference between single-threaded and multithreaded servers.")
     elif lab2_ok and speedup > 2:
-        print("👍 GOOD: Lab 2 shows significant speedup over Lab 1.")
+        _say("👍 GOOD: Lab 2 shows significant speedup over Lab 1.")
     elif speedup > 1.2:
-        print("⚠️  PARTIAL: Some speedup observed, but not optimal.")
+        _say("⚠️  PARTIAL: Some speedup observed, but not optimal.")
     else:
-        print("❌ ISSUE: No significant speedup. Check if both servers are configured correctly.")
+        _say("❌ ISSUE: No significant speedup. Check if both servers are configured correctly.")
     
-    print(f"\n💡 PLT THEORY:")
-    print(f"   Lab 1: Sequential program structure → Sequential execution")
-    print(f"   Lab 2: Concurrent program structure → Parallel execution (with speedup)")
-    print(f"   This demonstrates that concurrency (structure) enables parallelism (performance).")
+    _say(f"\n💡 PLT THEORY:")
+    _say(f"   Lab 1: Sequential program structure → Sequential execution")
+    _say(f"   Lab 2: Concurrent program structure → Parallel execution (with speedup)")
+    _say(f"   This demonstrates that concurrency (structure) enables parallelism (performance).")
 
 
 def compare_results(concurrent_result: dict, sequential_result: dict):
     """Compare and analyze the two test results (kept for compatibility)"""
-    print(f"\n{'🔄 COMPARISON ANALYSIS'}")
-    print(f"{'='*60}")
+    _say(f"\n{'🔄 COMPARISON ANALYSIS'}")
+    _say(f"{'='*60}")
     
     speedup = sequential_result['total_time'] / concurrent_result['total_time']
     
-    print(f"Sequential Total Time:   {sequential_result['total_time']:.3f}s")
-    print(f"Concurrent Total Time:   {concurrent_result['total_time']:.3f}s")
-    print(f"Speedup Factor:          {speedup:.1f}x")
+    _say(f"Sequential Total Time:   {sequential_result['total_time']:.3f}s")
+    _say(f"Concurrent Total Time:   {concurrent_result['total_time']:.3f}s")
+    _say(f"Speedup Factor:          {speedup:.1f}x")
     
     if speedup > 5:
-        print("🎯 EXCELLENT: True parallelism achieved!")
-        print("   Multiple threads are executing simultaneously on multiple cores.")
+        _say("🎯 EXCELLENT: True parallelism achieved!")
+        _say("   Multiple threads are executing simultaneously on multiple cores.")
     elif speedup > 2:
-        print("👍 GOOD: Decent parallelism with some overhead.")
+        _say("👍 GOOD: Decent parallelism with some overhead.")
     elif speedup > 1.1:
-        print("⚠️  LIMITED: Some concurrency but limited parallelism.")
+        _say("⚠️  LIMITED: Some concurrency but limited parallelism.")
     else:
-        print("❌ NO SPEEDUP: Server might be single-threaded or CPU bound.")
+        _say("❌ NO SPEEDUP: Server might be single-threaded or CPU bound.")
     
-    print(f"\n💡 THEORY:")
-    print(f"   With {concurrent_result['num_requests']} requests and ~1s handler delay:")
-    print(f"   - Threaded server (concurrent):  ~1-2s expected")
-    print(f"   - Single-threaded server:        ~{concurrent_result['num_requests']}s expected")
+    _say(f"\n💡 THEORY:")
+    _say(f"   With {concurrent_result['num_requests']} requests and ~1s handler delay:")
+    _say(f"   - Threaded server (concurrent):  ~1-2s expected")
+    _say(f"   - Single-threaded server:        ~{concurrent_result['num_requests']}s expected")
 
 
 def main():
@@ -194,50 +470,68 @@ def main():
     parser.add_argument("--mode", choices=['lab1', 'lab2', 'compare'], 
                       default='compare', help="Test mode (default: compare both labs)")
     parser.add_argument("--delay", type=float, default=1.0, help="Expected server delay for analysis")
+    parser.add_argument("--engine", choices=['asyncio', 'selectors', 'threads'], default='asyncio',
+                      help="How concurrent requests are driven (default: asyncio)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                      help=f"Thread cap for --engine threads (default: {DEFAULT_MAX_WORKERS})")
+    parser.add_argument("--limit", type=int, default=DEFAULT_CONNECTION_LIMIT,
+                      help=f"Connections in flight at once for --engine asyncio (default: {DEFAULT_CONNECTION_LIMIT})")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                      help=f"List every request even when there are more than {MAX_LISTED_REQUESTS}")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                      help="Only print the summary of each run, never the per-request list")
+    parser.add_argument("--no-emoji", action="store_true",
+                      help="ASCII-only output (OK/FAIL instead of emoji), e.g. for CI logs")
     
     args = parser.parse_args()
+    global _emoji
+    _emoji = not args.no_emoji
+    # one thread pool and one set of connection pools for every URL tested below
+    ctx = BenchmarkContext(args.max_workers, args.limit)
+    atexit.register(ctx.close)
     
-    print(f"🧪 LAB COMPARISON: Lab 1 (Single-threaded) vs Lab 2 (Multithreaded)")
-    print(f"Lab 1 URL: {args.lab1_url}")
-    print(f"Lab 2 URL: {args.lab2_url}")
-    print(f"Requests: {args.requests}")
-    print(f"Mode: {args.mode}")
-    print(f"Expected per-request delay: {args.delay}s")
-    print(f"Expected Lab 1 time: ~{args.requests * args.delay}s (sequential processing)")
-    print(f"Expected Lab 2 time: ~{args.delay}s (parallel processing)")
+    _say(f"🧪 LAB COMPARISON: Lab 1 (Single-threaded) vs Lab 2 (Multithreaded)")
+    _say(f"Lab 1 URL: {args.lab1_url}")
+    _say(f"Lab 2 URL: {args.lab2_url}")
+    _say(f"Requests: {args.requests}")
+    _say(f"Mode: {args.mode}")
+    _say(f"Expected per-request delay: {args.delay}s")
+    _say(f"Expected Lab 1 time: ~{args.requests * args.delay}s (sequential processing)")
+    _say(f"Expected Lab 2 time: ~{args.delay}s (parallel processing)")
     
-    print(f"\n⚠️  Make sure BOTH servers are running with HANDLER_DELAY={args.delay}!")
-    print(f"   Lab 1: Single-threaded HTTP server on port 8001")
-    print(f"   Lab 2: Multithreaded HTTP server on port 8000")
+    _say(f"\n⚠️  Make sure BOTH servers are running with HANDLER_DELAY={args.delay}!")
+    _say(f"   Lab 1: Single-threaded HTTP server on port 8001")
+    _say(f"   Lab 2: Multithreaded HTTP server on port 8000")
     
     try:
         if args.mode in ['lab1', 'compare']:
-            print(f"\n{'='*60}")
-            print(f"🐌 TESTING LAB 1 SERVER (Single-threaded)")
-            print(f"{'='*60}")
-            lab1_result = test_concurrent_requests(args.lab1_url, args.requests)
+            _say(f"\n{'='*60}")
+            _say(f"🐌 TESTING LAB 1 SERVER (Single-threaded)")
+            _say(f"{'='*60}")
+            lab1_result = ctx.run(args.lab1_url, args.requests, args.engine)
             lab1_result['mode'] = 'LAB 1 (Single-threaded)'
-            print_results(lab1_result)
+            print_results(lab1_result, args.verbose, args.quiet)
         
         if args.mode in ['lab2', 'compare']:
             if args.mode == 'compare':
-                print(f"\n{'⏳ Waiting 2 seconds between tests...'}")
-                time.sleep(2)
+                _say(f"\n{'⏳ Waiting for the Lab 2 server to answer...'}")
+                if not _probe(args.lab2_url):
+                    _say(f"⚠️  Lab 2 server did not answer within 5s, testing anyway")
             
-            print(f"\n{'='*60}")
-            print(f"🚀 TESTING LAB 2 SERVER (Multithreaded)")
-            print(f"{'='*60}")
-            lab2_result = test_concurrent_requests(args.lab2_url, args.requests)
+            _say(f"\n{'='*60}")
+            _say(f"🚀 TESTING LAB 2 SERVER (Multithreaded)")
+            _say(f"{'='*60}")
+            lab2_result = ctx.run(args.lab2_url, args.requests, args.engine)
             lab2_result['mode'] = 'LAB 2 (Multithreaded)'
-            print_results(lab2_result)
+            print_results(lab2_result, args.verbose, args.quiet)
         
         if args.mode == 'compare':
             compare_lab_results(lab1_result, lab2_result, args.delay, args.requests)
         
     except KeyboardInterrupt:
-        print(f"\n❌ Test interrupted by user")
+        _say(f"\n❌ Test interrupted by user")
     except Exception as e:
-        print(f"\n❌ Test failed: {e}")
+        _say(f"\n❌ Test failed: {e}")
 
 
 if __name__ == "__main__":
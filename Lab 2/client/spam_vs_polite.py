@@ -2,24 +2,51 @@ from __future__ import annotations
 
 import argparse
 import concurrent.futures
+import http.client
+import os
+import sys
 import time
-import urllib.request
 from typing import Tuple
+from urllib.parse import urlsplit
+
+if __package__ in (None, ""):
+    # run as a script (python client/spam_vs_polite.py): make the app package importable
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from app.http_pool import ConnectionPool
+
+
+class _Client:
+    """Keep-alive GETs of one URL that only report status codes"""
+
+    def __init__(self, url: str) -> None:
+        u = urlsplit(url)
+        self.path = (u.path or "/") + ("?" + u.query if u.query else "")
+        # a single caller per client, so one pooled connection is enough
+        self.pool = ConnectionPool(u.hostname or "localhost", u.port or 80, maxsize=1)
+
+    def status(self) -> int:
+        """GET the path and return its status, or 0 if the server cannot be reached"""
+        try:
+            return self.pool.get_status(self.path)  # stale keep-alive sockets are retried inside
+        except (OSError, http.client.HTTPException):
+            return 0
+
+    def close(self) -> None:
+        self.pool.close()
 
 
 def fetch(url: str, count: int, label: str) -> Tuple[str, int, int, float]:
     ok = 0
     blocked = 0
+    client = _Client(url)
     start = time.perf_counter()
     for _ in range(count):
-        try:
-            with urllib.request.urlopen(url) as resp:
-                if resp.status == 200:
-                    ok += 1
-                elif resp.status == 429:
-                    blocked += 1
-        except Exception:
-            pass
+        status = client.status()
+        if status == 200:
+            ok += 1
+        elif status == 429:
+            blocked += 1
+    client.close()
     return label, ok, blocked, time.perf_counter() - start
 
 
@@ -36,39 +63,49 @@ def main() -> int:
     target_rps = args.rate
     url = args.url
 
+    # time between spammer requests, computed once
+    period = 1.0 / target_rps
+
     def spammer():
-        end = time.time() + duration
+        now = time.monotonic()
+        end = now + duration
+        next_tick = now + period
         sent = 0
         ok = 0
         blocked = 0
-        while time.time() < end:
-            try:
-                with urllib.request.urlopen(url) as resp:
-                    if resp.status == 200:
-                        ok += 1
-                    elif resp.status == 429:
-                        blocked += 1
-            except Exception:
-                pass
+        client = _Client(url)
+        while now < end:
+            status = client.status()
+            if status == 200:
+                ok += 1
+            elif status == 429:
+                blocked += 1
             sent += 1
-            # Short sleep to roughly control rate
-            time.sleep(max(0, 1.0 / target_rps))
+            # Sleep until the next slot on a fixed schedule, so the time spent
+            # in the request itself does not lower the rate
+            now = time.monotonic()
+            if next_tick > now:
+                time.sleep(next_tick - now)
+                now = next_tick
+            elif now - next_tick > period:
+                next_tick = now  # fell more than a slot behind: don't burst to catch up
+            next_tick += period
+        client.close()
         return ("spammer", ok, blocked, duration)
 
     def polite():
-        end = time.time() + duration
+        end = time.monotonic() + duration
         ok = 0
         blocked = 0
-        while time.time() < end:
-            try:
-                with urllib.request.urlopen(url) as resp:
-                    if resp.status == 200:
-                        ok += 1
-                    elif resp.status == 429:
-                        blocked += 1
-            except Exception:
-                pass
+        client = _Client(url)
+        while time.monotonic() < end:
+            status = client.status()
+            if status == 200:
+                ok += 1
+            elif status == 429:
+                blocked += 1
             time.sleep(0.22)  # ~4.5 rps
+        client.close()
         return ("polite", ok, blocked, duration)
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
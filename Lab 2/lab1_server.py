@@ -4,7 +4,11 @@ Lab 1 Style Server - Simple Single-threaded HTTP Server
 This simulates the "previous lab" single-threaded server for comparison.
 """
 
+import io
 import os
+import signal
+import socket
+import sys
 import time
 import argparse
 from http.server import HTTPServer, SimpleHTTPRequestHandler
@@ -14,10 +18,36 @@ from http import HTTPStatus
 class Lab1Handler(SimpleHTTPRequestHandler):
     """Simple handler with delay - always single-threaded"""
     
+    # Seconds of artificial work per GET, set once from --delay in main()
+    delay = 1.0
+    # --use-sendfile: send file bodies with sendfile() and a larger socket send buffer
+    use_sendfile = False
+    send_buffer_size = 4 << 20
+    
+    def setup(self):
+        super().setup()
+        if self.use_sendfile:
+            try:
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+            except OSError:
+                pass  # keep the kernel default
+    
+    def copyfile(self, source, outputfile):
+        """Zero-copy file bodies in --use-sendfile mode; plain read/write loop otherwise"""
+        if self.use_sendfile:
+            try:
+                source.fileno()
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                pass  # not a real file (e.g. a directory listing buffer)
+            else:
+                outputfile.flush()  # headers first
+                self.connection.sendfile(source)
+                return
+        super().copyfile(source, outputfile)
+    
     def do_GET(self):
         # Add artificial delay to simulate work
-        delay = float(os.getenv('HANDLER_DELAY', '1.0'))
-        time.sleep(delay)
+        time.sleep(self.delay)
         
         # Serve the request normally
         super().do_GET()
@@ -27,21 +57,94 @@ class Lab1Handler(SimpleHTTPRequestHandler):
         print(f"Lab1 Server: {format % args}")
 
 
+class ReusePortHTTPServer(HTTPServer):
+    """Single-threaded server whose port can be shared by several processes (SO_REUSEPORT)"""
+    
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def serve_parallel(port, parallelism):
+    """Fork parallelism single-threaded servers on one port; the kernel spreads connections"""
+    children = []
+    for _ in range(parallelism):
+        pid = os.fork()
+        if pid == 0:
+            # Child: its own listening socket, still one request at a time
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                httpd = ReusePortHTTPServer(("0.0.0.0", port), Lab1Handler)
+            except OSError as e:
+                print(f"Lab 1 Server worker {os.getpid()}: cannot listen on port {port}: {e}", file=sys.stderr)
+                os._exit(1)
+            try:
+                httpd.serve_forever()
+            finally:
+                httpd.server_close()
+                os._exit(0)
+        children.append(pid)
+    
+    # Stopping the parent (Ctrl+C or SIGTERM) stops every child with it
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    exit_code = 0
+    try:
+        # workers only return on failure, so the first one to exit ends the server
+        pid, status = os.wait()
+        children.remove(pid)
+        print(f"Lab 1 Server worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, "
+              f"stopping the others", file=sys.stderr)
+        exit_code = 1
+    except KeyboardInterrupt:
+        print("\nLab 1 Server shutting down...")
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+    return exit_code
+
+
 def main():
     parser = argparse.ArgumentParser(description="Lab 1 Style Single-threaded HTTP Server")
     parser.add_argument("--port", type=int, default=8001, help="Port to listen on (default: 8001)")
     parser.add_argument("--doc-root", type=str, default="www", help="Document root directory")
     parser.add_argument("--delay", type=float, default=1.0, help="Handler delay in seconds")
+    parser.add_argument("--parallelism", type=int, default=1,
+                        help="Number of single-threaded server processes sharing the port (default: 1)")
+    parser.add_argument("--use-sendfile", action="store_true",
+                        help="Throughput mode: send files with sendfile() and a 4 MiB send buffer")
     
     args = parser.parse_args()
     
     # Set environment for handler
     os.environ['HANDLER_DELAY'] = str(args.delay)
+    Lab1Handler.delay = args.delay
+    Lab1Handler.use_sendfile = args.use_sendfile
     
     # Change to document root
     if os.path.exists(args.doc_root):
         os.chdir(args.doc_root)
     
+    if args.parallelism > 1:
+        if not hasattr(os, "fork") or not hasattr(socket, "SO_REUSEPORT"):
+            print("--parallelism needs fork() and SO_REUSEPORT (Linux/macOS)")
+            sys.exit(2)
+        print(f"Lab 1 Single-threaded Server starting {args.parallelism} processes...")
+        print(f"   Port: {args.port} (SO_REUSEPORT)")
+        print(f"   Document Root: {args.doc_root}")
+        print(f"   Handler Delay: {args.delay}s")
+        print(f"   URL: http://localhost:{args.port}/")
+        print(f"\nNOTE: each process still handles ONE request at a time")
+        sys.stdout.flush()  # don't let the children inherit and repeat buffered output
+        sys.exit(serve_parallel(args.port, args.parallelism))
+    
     # Create single-threaded server (NOT ThreadingHTTPServer)
     httpd = HTTPServer(("0.0.0.0", args.port), Lab1Handler)
     
@@ -49,6 +152,7 @@ def main():
     print(f"   Port: {args.port}")
     print(f"   Document Root: {args.doc_root}")
     print(f"   Handler Delay: {args.delay}s")
+    print(f"   Sendfile: {'on' if args.use_sendfile else 'off'}")
     print(f"   URL: http://localhost:{args.port}/")
     print(f"\nWARNING: This server processes requests ONE AT A TIME (no threading)")
     
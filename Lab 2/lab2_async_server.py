@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Lab 2 Async Server - Single-threaded asyncio HTTP file server
+Runs every connection as a coroutine on one event loop: the handler delay is an
+asyncio.sleep, so N concurrent requests overlap without N threads.
+"""
+
+import os
+import asyncio
+import argparse
+import mimetypes
+from urllib.parse import unquote, urlsplit
+
+
+MAX_HEADER_BYTES = 64 * 1024
+# Seconds an idle keep-alive connection may wait for its next request
+KEEP_ALIVE_TIMEOUT = 15
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class AsyncFileServer:
+    """Serves files from doc_root over HTTP/1.1 keep-alive, sleeping delay seconds per GET"""
+
+    def __init__(self, doc_root, delay):
+        self.doc_root = os.path.realpath(doc_root)
+        self.delay = delay
+
+    def resolve(self, target):
+        """Map a request target to a file under doc_root, or None"""
+        path = unquote(urlsplit(target).path)
+        try:
+            full = os.path.realpath(os.path.join(self.doc_root, path.lstrip("/")))
+            if os.path.commonpath([self.doc_root, full]) != self.doc_root:
+                return None  # escapes the document root
+            if os.path.isdir(full):
+                full = os.path.join(full, "index.html")
+            return full if os.path.isfile(full) else None
+        except (ValueError, OSError):
+            return None  # e.g. an embedded NUL byte, or a path the OS rejects
+
+    def open_file(self, target):
+        """Resolve target and open it, returning (file, size) or None; runs in the executor"""
+        full = self.resolve(target)
+        if full is None:
+            return None
+        try:
+            f = open(full, "rb")
+        except OSError:
+            return None
+        return f, os.fstat(f.fileno()).st_size
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client or an error ends it"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split()
+                if len(parts) != 3:
+                    await self.send_error(writer, 400, close=True)
+                    return
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                if method not in ("GET", "HEAD"):
+                    await self.send_error(writer, 405, close=True)
+                    return
+                if method == "GET":
+                    # Simulated work: yields to the loop instead of blocking a thread
+                    await asyncio.sleep(self.delay)
+                # realpath, stat and open block on disk, so they run off the loop
+                opened = await asyncio.get_running_loop().run_in_executor(None, self.open_file, target)
+                await self.send_file(writer, opened, method == "HEAD", keep_alive)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass  # the client reset or closed mid-request
+        finally:
+            writer.close()
+
+    async def send_error(self, writer, status, close=False, head_only=False):
+        body = f"{status} {REASONS[status]}\n".encode("ascii")
+        headers = self.header_bytes(status, "text/plain; charset=utf-8", len(body), not close)
+        # a HEAD response carries the body's length but never the body
+        writer.write(headers if head_only else headers + body)
+        await writer.drain()
+
+    async def send_file(self, writer, opened, head_only, keep_alive):
+        if opened is None:
+            await self.send_error(writer, 404, close=not keep_alive, head_only=head_only)
+            return
+        f, size = opened
+        ctype = mimetypes.guess_type(f.name)[0] or "application/octet-stream"
+        with f:
+            writer.write(self.header_bytes(200, ctype, size, keep_alive))
+            if not head_only and size:
+                await writer.drain()
+                # loop.sendfile uses os.sendfile where the transport allows it
+                await asyncio.get_running_loop().sendfile(writer.transport, f)
+        await writer.drain()
+
+    @staticmethod
+    def header_bytes(status, ctype, length, keep_alive):
+        return (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {ctype}\r\n"
+            f"Content-Length: {length}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+
+
+async def serve(port, doc_root, delay):
+    app = AsyncFileServer(doc_root, delay)
+    server = await asyncio.start_server(app.handle, "0.0.0.0", port, limit=MAX_HEADER_BYTES, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lab 2 asyncio single-threaded HTTP file server")
+    parser.add_argument("--port", type=int, default=8002, help="Port to listen on (default: 8002)")
+    parser.add_argument("--doc-root", type=str, default="www", help="Document root directory")
+    parser.add_argument("--delay", type=float, default=float(os.getenv("HANDLER_DELAY", "1.0")),
+                        help="Handler delay in seconds (default: HANDLER_DELAY or 1.0)")
+
+    args = parser.parse_args()
+
+    print(f"Lab 2 Async Server starting...")
+    print(f"   Port: {args.port}")
+    print(f"   Document Root: {args.doc_root}")
+    print(f"   Handler Delay: {args.delay}s")
+    print(f"   URL: http://localhost:{args.port}/")
+
+    try:
+        asyncio.run(serve(args.port, args.doc_root, args.delay))
+    except KeyboardInterrupt:
+        print("\nLab 2 Async Server shutting down...")
+
+
+if __name__ == "__main__":
+    main()
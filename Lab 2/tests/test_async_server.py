@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+
+import lab2_async_server
+from lab2_async_server import AsyncFileServer
+
+
+async def _exchange(doc_root, request, **server_kwargs):
+    app = AsyncFileServer(str(doc_root), delay=0)
+    server = await asyncio.start_server(app.handle, "127.0.0.1", 0, **server_kwargs)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        data = await asyncio.wait_for(reader.read(), 5)  # until the server closes
+        writer.close()
+        return data
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_head_404_has_no_body(tmp_path):
+    one = b"HEAD /missing.html HTTP/1.1\r\nHost: x\r\n\r\n"
+    last = b"HEAD /missing.html HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+    data = asyncio.run(_exchange(tmp_path, one + last))
+    first, second, rest = data.split(b"\r\n\r\n")
+    assert first.startswith(b"HTTP/1.1 404 Not Found\r\n")
+    assert b"Connection: keep-alive" in first
+    assert second.startswith(b"HTTP/1.1 404 Not Found\r\n")  # framing kept: no stray body bytes
+    assert rest == b""
+
+
+def test_get_404_keeps_its_body(tmp_path):
+    data = asyncio.run(_exchange(tmp_path, b"GET /missing.html HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    assert data.endswith(b"\r\n\r\n404 Not Found\n")
+
+
+def test_idle_keep_alive_connection_is_closed(tmp_path, monkeypatch):
+    monkeypatch.setattr(lab2_async_server, "KEEP_ALIVE_TIMEOUT", 0.1)
+    assert asyncio.run(_exchange(tmp_path, b"")) == b""
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import concurrent.futures
+import threading
 
-from app.counter import NaiveCounter, LockedCounter
+import pytest
 
+from app.counter import NaiveCounter, LockedCounter, ShardedCounter
 
-def test_locked_counter_thread_safety():
-    c = LockedCounter()
+
+@pytest.mark.parametrize("counter_cls", [LockedCounter, ShardedCounter])
+def test_locked_counter_thread_safety(counter_cls):
+    c = counter_cls()
     key = "/foo"
     def worker():
         for _ in range(1000):
@@ -30,3 +34,55 @@ def test_naive_counter_race_likely():
             f.result()
     # Race is likely; assert it's not equal to 8000 to demonstrate
     assert c.snapshot().get(key, 0) != 8000
+
+
+def test_sharded_counter_keeps_unflushed_counts_of_finished_threads():
+    c = ShardedCounter()
+    def worker():
+        for _ in range(c.flush_every + 3):
+            c.inc("/bar")
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.snapshot()["/bar"] == 4 * (c.flush_every + 3)
+    c.reset()
+    assert c.snapshot().get("/bar", 0) == 0
+    c.inc("/bar")
+    assert c.snapshot()["/bar"] == 1
+
+
+def test_sharded_counter_reset_clears_counts_of_live_threads():
+    c = ShardedCounter()
+    for _ in range(c.flush_every + 3):  # one flush plus three unmerged
+        c.inc("/baz")
+    c.reset()
+    assert c.snapshot().get("/baz", 0) == 0
+    for _ in range(c.flush_every):  # the pending count restarted, so this flushes exactly once
+        c.inc("/baz")
+    assert c._counts["/baz"] == c.flush_every
+
+
+def test_sharded_counter_survives_thread_exit_during_snapshot():
+    c = ShardedCounter()
+    counted, release = threading.Event(), threading.Event()
+    def owner():
+        for _ in range(3):
+            c.inc("/qux")
+        counted.set()
+        release.wait()
+    def snapshot_while_owner_exits():
+        with c._lock:  # what snapshot()/reset() hold while iterating the shards
+            held = list(c._shards)
+            release.set()
+            t.join()
+            del held  # last reference: the finalizer runs with the lock held
+    t = threading.Thread(target=owner)
+    t.start()
+    counted.wait()
+    checker = threading.Thread(target=snapshot_while_owner_exits, daemon=True)
+    checker.start()
+    checker.join(timeout=5)
+    assert not checker.is_alive(), "finalizer deadlocked on the counter lock"
+    assert c.snapshot()["/qux"] == 3
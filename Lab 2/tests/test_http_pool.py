@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.http_pool import ConnectionPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 0.2  # the server drops idle keep-alive connections quickly
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+
+    def do_GET(self):
+        self.do_HEAD()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reuses_keep_alive_connections(server):
+    pool = ConnectionPool("127.0.0.1", server.server_port)
+    assert pool.get_status("/") == 200
+    conn = pool._idle.queue[-1]
+    assert pool.get_status("/") == 200
+    assert pool._idle.queue[-1] is conn
+    pool.close()
+
+
+def test_retries_a_connection_the_server_closed(server):
+    pool = ConnectionPool("127.0.0.1", server.server_port)
+    pool.warm("/", 3)
+    assert pool._idle.qsize() == 3
+    time.sleep(0.5)  # every pooled connection is now stale
+    assert pool.get_status("/") == 200
+    pool.close()
+
+
+def test_fresh_connection_errors_are_raised():
+    pool = ConnectionPool("127.0.0.1", 9, timeout=1)  # discard port: nothing listens
+    with pytest.raises(OSError):
+        pool.get_status("/")
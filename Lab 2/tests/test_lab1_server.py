@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+LAB1_SERVER = os.path.join(os.path.dirname(__file__), os.pardir, "lab1_server.py")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork") or not hasattr(socket, "SO_REUSEPORT"),
+                    reason="--parallelism needs fork() and SO_REUSEPORT")
+def test_parallel_workers_that_cannot_bind_stop_the_server(tmp_path):
+    taken = socket.socket()  # no SO_REUSEPORT, so every worker's bind fails
+    taken.bind(("0.0.0.0", 0))
+    taken.listen()
+    try:
+        proc = subprocess.run(
+            [sys.executable, LAB1_SERVER, "--port", str(taken.getsockname()[1]),
+             "--parallelism", "2", "--doc-root", str(tmp_path)],
+            capture_output=True, text=True, timeout=10)
+    finally:
+        taken.close()
+    assert proc.returncode == 1
+    assert "cannot listen on port" in proc.stderr
+    assert "Traceback" not in proc.stderr
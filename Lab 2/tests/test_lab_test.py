@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from client import lab_test
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_selectors_engine_records_sockets_that_fail_to_open(server_url, monkeypatch):
+    real_socket = socket.socket
+    opened = []
+    def limited_socket(*args, **kwargs):
+        if "fileno" in kwargs:  # socket.accept() on the server side
+            return real_socket(*args, **kwargs)
+        if len(opened) >= 3:
+            raise OSError(errno.EMFILE, "Too many open files")
+        s = real_socket(*args, **kwargs)
+        opened.append(s)
+        return s
+    monkeypatch.setattr(lab_test.socket, "socket", limited_socket)
+    results = lab_test._run_selectors(server_url, 5, timeout=5)
+    rows = sorted(results)
+    assert [status for _, _, status in rows] == [200, 200, 200, 0, 0]
+    assert all(dur >= 0 for _, dur, _ in rows)
+    assert all(s.fileno() == -1 for s in opened)  # nothing leaked
+
+
+def test_no_emoji_keeps_every_line_ascii(server_url, monkeypatch, capsys):
+    monkeypatch.setattr(lab_test, "_emoji", True)
+    monkeypatch.setattr(sys, "argv", [
+        "lab_test.py", "--mode", "compare", "--lab1-url", server_url, "--lab2-url", server_url,
+        "-n", "3", "--delay", "0", "--verbose", "--no-emoji",
+    ])
+    lab_test.main()
+    out = capsys.readouterr().out
+    assert "COMPARISON" in out and "TEST RESULTS" in out
+    assert out.isascii(), [line for line in out.splitlines() if not line.isascii()]
+
+
+def test_asyncio_engine_times_out_a_stalled_server():
+    stalled = socket.socket()
+    stalled.bind(("127.0.0.1", 0))
+    stalled.listen()  # the kernel completes the handshake, nobody ever answers
+    try:
+        url = f"http://127.0.0.1:{stalled.getsockname()[1]}/"
+        t0 = time.perf_counter()
+        rows = asyncio.run(lab_test._arun(url, 3, timeout=0.2))
+        assert [status for _, _, status in rows] == [0, 0, 0]
+        assert time.perf_counter() - t0 < 5
+    finally:
+        stalled.close()
+
+
+def test_asyncio_engine_respects_the_connection_limit():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    class _SlowHandler(_OkHandler):
+        def do_GET(self):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            super().do_GET()
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        rows = asyncio.run(lab_test._arun(f"http://127.0.0.1:{httpd.server_port}/", 8, limit=2))
+        assert [status for _, _, status in rows] == [200] * 8
+        assert peak[0] <= 2
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_threads_engine_uses_the_shared_pool(server_url):
+    ctx = lab_test.BenchmarkContext(max_workers=4)
+    try:
+        result = ctx.run(server_url, 6, engine="threads")
+        assert result["successful"] == 6
+        assert isinstance(next(iter(ctx.pools.values())), lab_test.ConnectionPool)
+    finally:
+        ctx.close()
@@ -16,3 +16,12 @@ def test_token_bucket_allows_rate():
     time.sleep(1.05)
     allowed = sum(1 for _ in range(5) if rl.allow(ip))
     assert allowed >= 4  # allow some timing jitter
+
+
+def test_buckets_are_independent_per_ip():
+    rl = RateLimiter(rps=1.0, burst=2)
+    assert rl.allow('10.0.0.1') and rl.allow('10.0.0.1')
+    assert not rl.allow('10.0.0.1')
+    # other clients keep their own full bucket, whichever stripe they land in
+    for n in range(2, 40):
+        assert rl.allow(f'10.0.0.{n}')
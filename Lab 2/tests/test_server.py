@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import errno
+import socket
+
+import pytest
+
+from app.counter import LockedCounter, ShardedCounter
+from app.server import Config, make_server
+
+
+@pytest.mark.parametrize("server_type", ["single", "threaded", "evented"])
+def test_make_server_reports_port_in_use(server_type):
+    taken = socket.socket()
+    taken.bind(("0.0.0.0", 0))
+    taken.listen()
+    try:
+        cfg = Config()
+        cfg.port = taken.getsockname()[1]
+        cfg.server_type = server_type
+        with pytest.raises(OSError) as excinfo:
+            make_server(cfg)
+        assert excinfo.value.errno == errno.EADDRINUSE
+    finally:
+        taken.close()
+
+
+@pytest.mark.parametrize("server_type, counter_cls", [
+    ("single", LockedCounter), ("threaded", LockedCounter), ("evented", ShardedCounter),
+])
+def test_make_server_shards_the_counter_only_for_the_event_loop(server_type, counter_cls):
+    cfg = Config()
+    cfg.port = 0
+    cfg.server_type = server_type
+    httpd, handler = make_server(cfg)
+    try:
+        assert type(handler.counter) is counter_cls
+    finally:
+        httpd.server_close()